@@ -5,21 +5,40 @@ This gateway provides a REST API for extracting structured cancer information
 from clinical text using a fine-tuned Llama 3.1 8B model served by vLLM.
 """
 import os
+import sys
 from contextlib import asynccontextmanager
 
+import orjson
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from loguru import logger
 
+from gateway.middleware.cors import CachedCORSMiddleware
 from gateway.routers import health, extraction
+from gateway.services.vllm_client import BatchScheduler, VLLMClient
 
 # Configure loguru for gateway logging
+# enqueue=True hands records to a background worker so request handlers never
+# block on sink I/O; the default stderr handler is replaced with a queued one.
+logger.remove()
+logger.add(
+    sys.stderr,
+    level="INFO",
+    enqueue=True,
+    backtrace=False,
+    diagnose=False,
+)
 logger.add(
     "logs/gateway_{time}.log",
     rotation="100 MB",
     retention="7 days",
     level="INFO",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+    enqueue=True,
+    backtrace=False,
+    diagnose=False,
+    serialize=True,  # Fixed-cost JSON records
+    buffering=8192,
 )
 
 
@@ -30,18 +49,27 @@ async def lifespan(app_instance: FastAPI):
     
     Replaces deprecated @app.on_event("startup") and @app.on_event("shutdown").
     
+    Creates the shared VLLMClient and BatchScheduler on app.state so all routers
+    reuse one pooled HTTP/2 connection to vLLM.
+    
     Args:
-        app_instance: FastAPI application instance (unused but required by signature)
+        app_instance: FastAPI application instance
     """
     # Startup: Runs when application starts
     logger.info("🚀 Medical IE Gateway starting up...")
     logger.info("   Version: 0.1.0")
     logger.info("   Docs: http://localhost:8080/docs")
+    app_instance.state.vllm = VLLMClient()
+    app_instance.state.batch_scheduler = BatchScheduler(app_instance.state.vllm)
+    await app_instance.state.batch_scheduler.start()
     
     yield  # Application runs here
     
     # Shutdown: Runs when application stops
+    await app_instance.state.batch_scheduler.stop()
+    await app_instance.state.vllm.close()
     logger.info("👋 Medical IE Gateway shutting down...")
+    await logger.complete()  # Flush queued log records (last logging call)
 
 
 # Initialize FastAPI application with lifespan handler
@@ -52,6 +80,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -59,15 +88,14 @@ app = FastAPI(
 # CORS_ORIGINS env var: comma-separated list of allowed origins
 # Example: CORS_ORIGINS="https://medical-ie.vercel.app,https://localhost:3000"
 # Default: "*" (allow all - suitable for Stage 2 testing, restrict in Stage 3+)
+# Headers are precomputed once and preflights are cacheable for 24h (Access-Control-Max-Age)
 allowed_origins = os.getenv("CORS_ORIGINS", "*")
 origins_list = [allowed_origins] if allowed_origins == "*" else allowed_origins.split(",")
 
 app.add_middleware(
-    CORSMiddleware,
+    CachedCORSMiddleware,
     allow_origins=origins_list,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"]
+    allow_credentials=True
 )
 
 # Include routers
@@ -75,14 +103,32 @@ app.include_router(health.router)
 app.include_router(extraction.router)
 
 
+# Root endpoint payload never changes, so it is serialized once at import
+_ROOT_BYTES = orjson.dumps({
+    "service": "Medical Information Extraction Gateway",
+    "version": "0.1.0",
+    "docs": "/docs",
+    "health": "/health",
+    "extraction": "/api/v1/extract"
+})
+
+
 # Root endpoint
 @app.get("/")
-async def root():
+async def root() -> Response:
     """Root endpoint with API information."""
-    return {
-        "service": "Medical Information Extraction Gateway",
-        "version": "0.1.0",
-        "docs": "/docs",
-        "health": "/health",
-        "extraction": "/api/v1/extract"
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Local entry point mirroring the container CMD (gateway/Dockerfile)
+    uvicorn.run(
+        "gateway.main:app",
+        host="0.0.0.0",
+        port=8080,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
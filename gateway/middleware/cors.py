@@ -0,0 +1,143 @@
+"""
+Lightweight CORS middleware with precomputed headers.
+
+Replaces Starlette's CORSMiddleware for the gateway's fixed policy (all methods,
+all headers, credentials allowed). Header tuples and the allowed-origin set are
+built once at startup, so per-request work is a set lookup and a list append.
+Preflight responses carry Access-Control-Max-Age so browsers cache them.
+
+Origins are compared literally, exactly as Starlette's CORSMiddleware does.
+"""
+
+from typing import List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ALLOW_METHODS = "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+PREFLIGHT_MAX_AGE = 86400
+
+
+class CachedCORSMiddleware:
+    """
+    ASGI middleware applying a static CORS policy.
+
+    Origins are exact strings ("https://medical-extraction.vercel.app"), or "*" for
+    any origin. Allowed origins are echoed back with `Vary: Origin`, which is valid
+    alongside credentials.
+
+    Attributes:
+        app: Wrapped ASGI application
+        allow_all: Whether any origin is accepted
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Sequence[str] = ("*",),
+        allow_credentials: bool = True,
+        max_age: int = PREFLIGHT_MAX_AGE,
+    ):
+        """
+        Initialize middleware and precompute response headers.
+
+        Args:
+            app: Wrapped ASGI application
+            allow_origins: Allowed origins (exact strings, or "*")
+            allow_credentials: Whether to send Access-Control-Allow-Credentials
+            max_age: Seconds browsers may cache preflight responses
+        """
+        self.app = app
+        origins = [origin.strip() for origin in allow_origins if origin.strip()]
+        self.allow_all = "*" in origins
+        self._exact = frozenset(origin.encode("latin-1") for origin in origins)
+
+        common: List[Tuple[bytes, bytes]] = [(b"vary", b"Origin")]
+        if allow_credentials:
+            common.append((b"access-control-allow-credentials", b"true"))
+        self._simple_headers = tuple(common)
+        self._preflight_headers = tuple(common) + (
+            (b"access-control-allow-methods", ALLOW_METHODS.encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+        )
+
+    def _is_allowed(self, origin: bytes) -> bool:
+        """
+        Check whether an origin is allowed.
+
+        Args:
+            origin: Raw Origin header value
+
+        Returns:
+            True if the origin matches the configured policy
+        """
+        return self.allow_all or origin in self._exact
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Apply CORS headers to HTTP responses and answer preflight requests."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed = self._is_allowed(origin)
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(send, origin, allowed, request_headers)
+            return
+
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+
+        extra_headers = ((b"access-control-allow-origin", origin),) + self._simple_headers
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + list(extra_headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(
+        self, send: Send, origin: bytes, allowed: bool, request_headers: bytes | None
+    ) -> None:
+        """
+        Respond to a CORS preflight request without invoking the application.
+
+        Args:
+            send: ASGI send callable
+            origin: Raw Origin header value
+            allowed: Whether the origin passed the policy check
+            request_headers: Raw Access-Control-Request-Headers value, if any
+        """
+        if not allowed:
+            body = b"Disallowed CORS origin"
+            headers = [(b"content-type", b"text/plain; charset=utf-8")]
+            status = 400
+        else:
+            body = b"OK"
+            headers = [(b"content-type", b"text/plain; charset=utf-8")]
+            headers.append((b"access-control-allow-origin", origin))
+            headers.extend(self._preflight_headers)
+            if request_headers:
+                # Any request header is allowed, so echo the requested list
+                headers.append((b"access-control-allow-headers", request_headers))
+            status = 200
+
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
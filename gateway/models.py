@@ -8,7 +8,7 @@ Defines schemas for:
 
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class MedicalExtractionRequest(BaseModel):
@@ -36,10 +36,8 @@ class MedicalExtractionRequest(BaseModel):
     )
     model: str = Field(default="medical-ie", description="Model to use for extraction")
 
-    class Config:
-        """Pydantic model configuration with example."""
-
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "text": "Patient diagnosed with stage 3 breast cancer with HER2 positive marker.",
                 "temperature": 0.3,
@@ -47,6 +45,7 @@ class MedicalExtractionRequest(BaseModel):
                 "model": "medical-ie",
             }
         }
+    )
 
 
 class MedicalExtractionResponse(BaseModel):
@@ -80,10 +79,8 @@ class MedicalExtractionResponse(BaseModel):
         ..., description="Total tokens used for this request", ge=0
     )
 
-    class Config:
-        """Pydantic model configuration with example."""
-
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "cancer_type": "breast cancer",
                 "stage": "3",
@@ -99,6 +96,7 @@ class MedicalExtractionResponse(BaseModel):
                 "tokens_used": 85,
             }
         }
+    )
 
 
 class HealthCheckResponse(BaseModel):
@@ -115,9 +113,8 @@ class HealthCheckResponse(BaseModel):
     vllm_available: bool = Field(..., description="vLLM backend availability")
     version: str = Field(..., description="Gateway version")
 
-    class Config:
-        """Pydantic model configuration with example."""
-
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {"status": "healthy", "vllm_available": True, "version": "0.1.0"}
         }
+    )
@@ -3,61 +3,205 @@ Medical information extraction endpoints.
 
 Provides API for extracting structured cancer information from clinical text.
 """
-from fastapi import APIRouter, HTTPException
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+import orjson
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from loguru import logger
 
 from gateway.models import MedicalExtractionRequest, MedicalExtractionResponse
-from gateway.services.vllm_client import VLLMClient
+from gateway.services.vllm_client import (
+    BatchScheduler,
+    VLLMClient,
+    get_batch_scheduler,
+    get_vllm,
+)
 from gateway.utils.prompts import medical_extraction_prompt
-from gateway.utils.parsers import parse_medical_output
+from gateway.utils.parsers import JsonObjectTracker, parse_medical_output
 
 router = APIRouter(prefix="/api/v1", tags=["extraction"])
 
-# Initialize vLLM client (shared across extraction requests)
-vllm_client = VLLMClient()
+# Fixed sampling settings shared by every extraction, so requests batch together
+# and vLLM sees the same request shape for prefix caching.
+# Stop sequences prevent redundant output (removed aggressive stops).
+EXTRACTION_STOP = ["Instruction:", "Input:", "###", "Clinical Text:"]
+EXTRACTION_TOP_P = 0.95
 
 
-@router.post("/extract", response_model=MedicalExtractionResponse)
-async def extract_medical_info(request: MedicalExtractionRequest) -> MedicalExtractionResponse:
+def _extraction_schema() -> dict:
     """
-    Extract structured medical information from clinical text.
-    
+    Build the JSON schema used for vLLM guided decoding.
+
+    Derived from MedicalExtractionResponse, keeping only the extracted entity
+    fields (raw_output and tokens_used are gateway metadata, not model output).
+
+    Returns:
+        JSON schema dict for an object of optional string fields
+    """
+    schema = MedicalExtractionResponse.model_json_schema()
+    properties = {
+        name: prop
+        for name, prop in schema["properties"].items()
+        if name not in ("raw_output", "tokens_used")
+    }
+    return {"type": "object", "properties": properties, "additionalProperties": False}
+
+
+# Constrains generation to valid JSON with the extraction fields only
+EXTRACTION_SCHEMA = _extraction_schema()
+
+# Outputs longer than this (chars) are parsed in a worker thread so pathological
+# generations don't block the event loop; typical outputs are parsed inline.
+PARSE_OFFLOAD_THRESHOLD = 4096
+
+
+async def _parse_output(raw_text: str) -> dict:
+    """
+    Parse model output, offloading to a thread only for large outputs.
+
     Args:
-        request: MedicalExtractionRequest with clinical text and generation params
-        
+        raw_text: Raw model output
+
     Returns:
-        MedicalExtractionResponse with extracted cancer information
-        
+        Dict with medical entity fields (all optional)
+    """
+    if len(raw_text) > PARSE_OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(parse_medical_output, raw_text)
+    return parse_medical_output(raw_text)
+
+
+# LRU cache of serialized responses for deterministic (temperature ~ 0) extractions.
+# Entries are immutable bytes, so no lock is needed on the single event loop.
+DETERMINISTIC_TEMPERATURE = 0.01
+RESPONSE_CACHE_SIZE = 1024
+_response_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+
+# Single-flight: concurrent identical requests await the first one's result.
+# Lookup and insertion happen without an intervening await, so the event loop
+# serializes them and no lock is required.
+_inflight: Dict[bytes, "asyncio.Future[bytes]"] = {}
+
+
+class _LeaderCancelled(Exception):
+    """Set on a single-flight future when the request running it was cancelled."""
+
+
+def _request_key(model: str, max_tokens: int, temperature: float, prompt: str) -> bytes:
+    """
+    Build a compact key identifying an extraction request.
+
+    Used both for the deterministic response cache and in-flight deduplication.
+    The key hashes the rendered prompt rather than the raw text, so any template
+    change yields new keys without a separate template version.
+
+    Args:
+        model: Model name used for generation
+        max_tokens: Generation length limit (affects the output)
+        temperature: Sampling temperature
+        prompt: Fully formatted prompt
+
+    Returns:
+        16-byte BLAKE2b digest
+    """
+    return hashlib.blake2b(
+        f"{model}|{max_tokens}|{temperature!r}|{prompt}".encode("utf-8"), digest_size=16
+    ).digest()
+
+
+async def _build_response(raw_text: str, tokens_used: int) -> dict:
+    """
+    Parse model output and build the MedicalExtractionResponse payload.
+
+    Shared by the plain and streaming endpoints so both apply the same checks.
+
+    Args:
+        raw_text: Raw model output (stripped)
+        tokens_used: Token usage reported for the request
+
+    Returns:
+        MedicalExtractionResponse fields as a plain dict
+
     Raises:
-        HTTPException 503: vLLM backend unavailable
-        HTTPException 500: Extraction or parsing failed
+        HTTPException 500: Output could not be parsed or has non-string field values
     """
-    logger.info(f"Extraction requested for {len(request.text)} chars of text")
+    # Parse structured medical information
+    try:
+        parsed = await _parse_output(raw_text)
+        logger.info(f"Successfully extracted medical info: {list(parsed.keys())}")
+    except Exception as e:
+        logger.error(f"Parsing failed: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to parse model output: {str(e)}"
+        ) from e
     
-    # Check vLLM availability first
-    if not await vllm_client.health_check():
-        logger.error("vLLM backend unavailable")
+    # The response skips model validation, so enforce the Optional[str] contract here
+    if any(v is not None and not isinstance(v, str) for v in parsed.values()):
+        logger.error(f"Parsed fields are not all strings: {parsed}")
         raise HTTPException(
-            status_code=503,
-            detail="vLLM backend is unavailable. Please try again later."
+            status_code=500,
+            detail="Failed to parse model output: non-string field values"
         )
     
-    # Generate prompt with proper formatting
-    prompt = medical_extraction_prompt(request.text)
-    logger.debug(f"Generated prompt ({len(prompt)} chars)")
-    
-    # Call vLLM completions endpoint
+    # Build response with parsed data + metadata. Inputs are already typed
+    # (Optional[str] fields, str, int), so skip validation via model_construct.
+    response = MedicalExtractionResponse.model_construct(
+        **parsed,
+        raw_output=raw_text,
+        tokens_used=tokens_used
+    )
+    return response.model_dump()
+
+
+async def _run_extraction(
+    request: MedicalExtractionRequest, prompt: str, batch_scheduler: BatchScheduler
+) -> bytes:
+    """
+    Run inference and parsing for one extraction and serialize the response.
+
+    Args:
+        request: Validated extraction request
+        prompt: Formatted extraction prompt
+        batch_scheduler: Shared micro-batcher for completions calls
+
+    Returns:
+        JSON-encoded MedicalExtractionResponse
+
+    Raises:
+        HTTPException 503: vLLM backend unreachable or timed out
+        HTTPException 502: vLLM backend returned an error response
+        HTTPException 500: Extraction or parsing failed
+    """
+    # Call vLLM completions endpoint (micro-batched with concurrent requests).
+    # No pre-flight health probe: the completion call itself reports backend failures.
     try:
-        result = await vllm_client.completions(
+        result = await batch_scheduler.submit(
             model=request.model,
             prompt=prompt,
             max_tokens=request.max_tokens,
             temperature=request.temperature,
-            # Stop sequences to prevent redundant output (removed aggressive stops)
-            stop=["Instruction:", "Input:", "###", "Clinical Text:"],
-            top_p=0.95
+            stop=EXTRACTION_STOP,
+            top_p=EXTRACTION_TOP_P,
+            guided_json=EXTRACTION_SCHEMA
         )
-        logger.debug(f"vLLM returned {result['usage']['total_tokens']} tokens")
+        logger.debug("vLLM returned {} tokens", result["usage"]["total_tokens"])
+    except (httpx.ConnectError, httpx.TimeoutException) as e:
+        logger.error(f"vLLM backend unavailable: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="vLLM backend is unavailable. Please try again later."
+        ) from e
+    except httpx.HTTPStatusError as e:
+        logger.error(f"vLLM returned HTTP {e.response.status_code}")
+        raise HTTPException(
+            status_code=502,
+            detail=e.response.text
+        ) from e
     except Exception as e:
         logger.error(f"vLLM completion failed: {e}")
         raise HTTPException(
@@ -69,26 +213,205 @@ async def extract_medical_info(request: MedicalExtractionRequest) -> MedicalExtr
     raw_text = result["choices"][0]["text"].strip()
     tokens_used = result["usage"]["total_tokens"]
     
-    logger.debug(f"Raw output ({len(raw_text)} chars): {raw_text[:200]}...")
+    # Lazy: the preview slice is only built when a DEBUG sink is active
+    logger.opt(lazy=True).debug(
+        "Raw output ({} chars): {}...", lambda: len(raw_text), lambda: raw_text[:200]
+    )
+    
+    payload = await _build_response(raw_text, tokens_used)
     
-    # Parse structured medical information
+    fields_extracted = sum(1 for name in EXTRACTION_SCHEMA["properties"] if payload[name])
+    logger.info(f"Extraction complete: {tokens_used} tokens, {fields_extracted} fields")
+    return orjson.dumps(payload)
+
+
+@router.post("/extract", response_model=MedicalExtractionResponse)
+async def extract_medical_info(
+    request: MedicalExtractionRequest,
+    batch_scheduler: BatchScheduler = Depends(get_batch_scheduler),
+) -> Response:
+    """
+    Extract structured medical information from clinical text.
+    
+    The body is serialized directly, so response_model only documents the schema
+    and FastAPI does not re-validate every field of the response. Identical
+    concurrent requests share a single vLLM call.
+    
+    Args:
+        request: MedicalExtractionRequest with clinical text and generation params
+        batch_scheduler: Shared micro-batcher for completions calls (injected)
+        
+    Returns:
+        JSON response with MedicalExtractionResponse fields
+        
+    Raises:
+        HTTPException 503: vLLM backend unreachable or timed out
+        HTTPException 502: vLLM backend returned an error response
+        HTTPException 500: Extraction or parsing failed
+    """
+    logger.info(f"Extraction requested for {len(request.text)} chars of text")
+    
+    # Generate prompt with proper formatting
+    prompt = medical_extraction_prompt(request.text)
+    logger.debug("Generated prompt ({} chars)", len(prompt))
+    
+    key = _request_key(request.model, request.max_tokens, request.temperature, prompt)
+    
+    # Greedy decoding is deterministic, so identical requests can reuse a prior response
+    deterministic = request.temperature <= DETERMINISTIC_TEMPERATURE
+    if deterministic:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            _response_cache.move_to_end(key)
+            logger.info("Extraction served from cache")
+            return Response(content=cached, media_type="application/json")
+    
+    # An identical request is already running: wait for its result instead
+    while (inflight := _inflight.get(key)) is not None:
+        logger.info("Joining identical in-flight extraction")
+        try:
+            body = await asyncio.shield(inflight)
+        except _LeaderCancelled:
+            # Its client disconnected; look again (this request may now run it)
+            continue
+        return Response(content=body, media_type="application/json")
+    
+    future: "asyncio.Future[bytes]" = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
     try:
-        parsed = parse_medical_output(raw_text)
-        logger.info(f"Successfully extracted medical info: {list(parsed.keys())}")
+        body = await _run_extraction(request, prompt, batch_scheduler)
+        future.set_result(body)
+    except asyncio.CancelledError:
+        # Waiters still have clients: hand the work to them instead of cancelling them
+        future.set_exception(_LeaderCancelled())
+        future.exception()
+        raise
     except Exception as e:
-        logger.error(f"Parsing failed: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to parse model output: {str(e)}"
-        ) from e
+        # Waiters re-raise the same HTTPException; mark it retrieved for the creator
+        future.set_exception(e)
+        future.exception()
+        raise
+    finally:
+        del _inflight[key]
     
-    # Build response with parsed data + metadata
-    response = MedicalExtractionResponse(
-        **parsed,
-        raw_output=raw_text,
-        tokens_used=tokens_used
+    if deterministic:
+        _response_cache[key] = body
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    
+    return Response(content=body, media_type="application/json")
+
+
+def _sse(data: dict, event: Optional[str] = None) -> bytes:
+    """
+    Encode one server-sent event.
+
+    Args:
+        data: JSON-serializable payload
+        event: Optional event name (omitted for plain data events)
+
+    Returns:
+        SSE frame bytes
+    """
+    prefix = f"event: {event}\n".encode() if event else b""
+    return prefix + b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+async def _stream_extraction(
+    vllm_client: VLLMClient, request: MedicalExtractionRequest, prompt: str
+) -> AsyncIterator[bytes]:
+    """
+    Relay vLLM output as SSE deltas, then emit the parsed extraction.
+
+    Generation is cut off as soon as the first JSON object closes; closing the
+    upstream stream makes vLLM abort the request and free the sequence.
+
+    Args:
+        vllm_client: Shared vLLM client
+        request: Validated extraction request
+        prompt: Formatted extraction prompt
+
+    Yields:
+        SSE frames: data events with {"delta": ...}, then a "result" event with the
+        MedicalExtractionResponse payload (or an "error" event)
+    """
+    tracker = JsonObjectTracker()
+    pieces = []
+    tokens_used = 0
+
+    stream = vllm_client.completions_stream(
+        model=request.model,
+        prompt=prompt,
+        max_tokens=request.max_tokens,
+        temperature=request.temperature,
+        stop=EXTRACTION_STOP,
+        top_p=EXTRACTION_TOP_P,
+        guided_json=EXTRACTION_SCHEMA,
     )
+    try:
+        async for chunk in stream:
+            if chunk.get("usage"):
+                tokens_used = chunk["usage"]["total_tokens"]
+            for choice in chunk.get("choices", []):
+                delta = choice.get("text", "")
+                end = tracker.feed(delta)
+                if end != -1:
+                    delta = delta[:end]
+                if delta:
+                    pieces.append(delta)
+                    yield _sse({"delta": delta})
+            if tracker.complete:
+                logger.debug("JSON object complete, closing vLLM stream early")
+                break
+    except (httpx.ConnectError, httpx.TimeoutException) as e:
+        logger.error(f"vLLM backend unavailable: {e}")
+        yield _sse({"detail": "vLLM backend is unavailable. Please try again later."}, "error")
+        return
+    except httpx.HTTPError as e:
+        logger.error(f"vLLM streaming completion failed: {e}")
+        yield _sse({"detail": f"Model inference failed: {str(e)}"}, "error")
+        return
+    except Exception as e:
+        # Malformed stream chunks etc.; the client is still owed a terminal event
+        logger.error(f"vLLM streaming completion failed: {e}")
+        yield _sse({"detail": f"Model inference failed: {str(e)}"}, "error")
+        return
+    finally:
+        await stream.aclose()
+
+    raw_text = "".join(pieces).strip()
+    try:
+        payload = await _build_response(raw_text, tokens_used)
+    except HTTPException as e:
+        yield _sse({"detail": e.detail}, "error")
+        return
+
+    logger.info(f"Streaming extraction complete: {tokens_used} tokens")
+    yield _sse(payload, "result")
+
+
+@router.post("/extract/stream")
+async def extract_medical_info_stream(
+    request: MedicalExtractionRequest,
+    vllm_client: VLLMClient = Depends(get_vllm),
+) -> StreamingResponse:
+    """
+    Stream medical information extraction as server-sent events.
     
-    fields_extracted = sum(1 for v in parsed.values() if v)
-    logger.info(f"Extraction complete: {tokens_used} tokens, {fields_extracted} fields")
-    return response
+    Model output is forwarded as it is generated (lower time-to-first-token),
+    followed by a final "result" event with the same payload as /extract.
+    
+    Args:
+        request: MedicalExtractionRequest with clinical text and generation params
+        vllm_client: Shared vLLM client (injected)
+        
+    Returns:
+        StreamingResponse with media type text/event-stream
+    """
+    logger.info(f"Streaming extraction requested for {len(request.text)} chars of text")
+    
+    prompt = medical_extraction_prompt(request.text)
+    return StreamingResponse(
+        _stream_extraction(vllm_client, request, prompt),
+        media_type="text/event-stream",
+    )
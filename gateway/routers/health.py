@@ -3,46 +3,56 @@ Health check endpoints for the FastAPI gateway.
 
 Provides health status for the gateway itself and the vLLM backend server.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
 from loguru import logger
 
 from gateway.models import HealthCheckResponse
-from gateway.services.vllm_client import VLLMClient
+from gateway.services.vllm_client import VLLMClient, get_vllm
 
 router = APIRouter(tags=["health"])
 
-# Initialize vLLM client (shared across health check requests)
-vllm_client = VLLMClient()
+# /health has only two possible bodies; serialize both once so probes skip
+# model construction and JSON encoding
+_HEALTH_OK = HealthCheckResponse(
+    status="healthy", vllm_available=True, version="0.1.0"
+).model_dump_json().encode()
+_HEALTH_DEGRADED = HealthCheckResponse(
+    status="healthy", vllm_available=False, version="0.1.0"
+).model_dump_json().encode()
 
 
 @router.get("/health", response_model=HealthCheckResponse)
-async def health_check() -> HealthCheckResponse:
+async def health_check(vllm_client: VLLMClient = Depends(get_vllm)) -> Response:
     """
     Check the health status of the gateway and vLLM backend.
     
+    Args:
+        vllm_client: Shared vLLM client (injected)
+    
     Returns:
-        HealthCheckResponse with gateway status and vLLM availability
+        Pre-serialized HealthCheckResponse with gateway status and vLLM availability
     """
     logger.debug("Health check requested")
     
-    # Check vLLM backend availability
+    # Check vLLM backend availability (cached briefly by VLLMClient)
     vllm_available = await vllm_client.health_check()
     
-    response = HealthCheckResponse(
-        status="healthy",
-        vllm_available=vllm_available,
-        version="0.1.0"
-    )
-    
     logger.info(f"Health check complete: gateway=healthy, vllm={vllm_available}")
-    return response
+    return Response(
+        content=_HEALTH_OK if vllm_available else _HEALTH_DEGRADED,
+        media_type="application/json"
+    )
 
 
 @router.get("/health/vllm")
-async def vllm_health_check() -> dict:
+async def vllm_health_check(vllm_client: VLLMClient = Depends(get_vllm)) -> dict:
     """
     Direct vLLM backend health check endpoint.
     
+    Args:
+        vllm_client: Shared vLLM client (injected)
+    
     Returns:
         Dict with vLLM availability status
     """
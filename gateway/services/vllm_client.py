@@ -2,12 +2,22 @@
 vLLM HTTP client wrapper for making requests to vLLM server.
 """
 
+import asyncio
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Union
 
 import httpx
+import orjson
+from fastapi import Request
 from loguru import logger
 
+# Per-phase HTTP timeouts (seconds); the read timeout is configurable per client
+CONNECT_TIMEOUT = 2.0
+WRITE_TIMEOUT = 5.0
+POOL_TIMEOUT = 5.0
+HEALTH_CHECK_TIMEOUT = 2.0
+
 
 class VLLMClient:
     """
@@ -20,18 +30,22 @@ class VLLMClient:
 
     Attributes:
         base_url: Base URL of vLLM server (from VLLM_BASE_URL env var)
-        timeout: Request timeout in seconds (default: 60.0)
-        client: Async HTTP client instance
+        timeout: Read timeout in seconds for generation requests (default: 60.0)
+        health_ttl: Seconds a health check result is reused (default: 2.0)
+        client: Async HTTP/2 client instance with a shared connection pool
     """
 
-    def __init__(self, base_url: str | None = None, timeout: float = 60.0):
+    def __init__(
+        self, base_url: str | None = None, timeout: float = 60.0, health_ttl: float = 2.0
+    ):
         """
         Initialize vLLM client.
 
         Args:
             base_url: Base URL of vLLM server (defaults to VLLM_BASE_URL env var,
                       falls back to http://localhost:8000 for local development)
-            timeout: Request timeout in seconds
+            timeout: Read timeout in seconds (connect/write/pool use short fixed limits)
+            health_ttl: Seconds a health check result is cached before re-probing
         """
         # Priority: explicit arg > env var > localhost fallback
         if base_url is None:
@@ -39,7 +53,24 @@ class VLLMClient:
         
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        # HTTP/2 multiplexes concurrent requests over pooled keep-alive connections.
+        # Only reads get the long timeout (generation time); connect/write/pool fail
+        # fast so a stalled connection cannot starve the shared pool.
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                connect=CONNECT_TIMEOUT, read=timeout, write=WRITE_TIMEOUT, pool=POOL_TIMEOUT
+            ),
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=256, max_keepalive_connections=128, keepalive_expiry=30.0
+            ),
+        )
+
+        # Health check cache: concurrent callers share one probe per TTL window
+        self.health_ttl = health_ttl
+        self._health_cached: bool | None = None
+        self._health_expiry = 0.0
+        self._health_lock = asyncio.Lock()
         logger.info(f"Initialized VLLMClient with base_url={self.base_url}, timeout={timeout}s")
 
     async def close(self):
@@ -51,6 +82,9 @@ class VLLMClient:
         """
         Check if vLLM server is healthy and responsive.
 
+        The result is cached for `health_ttl` seconds so rapid-fire callers do not
+        each pay an extra HTTP round-trip to vLLM.
+
         Returns:
             True if server is healthy, False otherwise
 
@@ -60,8 +94,29 @@ class VLLMClient:
             >>> print(is_healthy)
             True
         """
+        if self._health_cached is not None and time.monotonic() < self._health_expiry:
+            return self._health_cached
+
+        async with self._health_lock:
+            # Another caller may have refreshed the cache while we waited for the lock
+            if self._health_cached is not None and time.monotonic() < self._health_expiry:
+                return self._health_cached
+
+            self._health_cached = await self._probe_health()
+            self._health_expiry = time.monotonic() + self.health_ttl
+            return self._health_cached
+
+    async def _probe_health(self) -> bool:
+        """
+        Issue the actual GET /health request to vLLM.
+
+        Returns:
+            True if server responded with 200, False otherwise
+        """
         try:
-            response = await self.client.get(f"{self.base_url}/health")
+            response = await self.client.get(
+                f"{self.base_url}/health", timeout=HEALTH_CHECK_TIMEOUT
+            )
             is_healthy = response.status_code == 200
             if is_healthy:
                 logger.info("vLLM health check passed")
@@ -75,11 +130,12 @@ class VLLMClient:
     async def completions(
         self,
         model: str,
-        prompt: str,
+        prompt: Union[str, List[str]],
         max_tokens: int = 512,
         temperature: float = 0.3,
         top_p: float = 1.0,
         stop: Optional[List[str]] = None,
+        guided_json: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -87,11 +143,12 @@ class VLLMClient:
 
         Args:
             model: Model name (e.g., "medical-ie" for LoRA adapter)
-            prompt: Input prompt text
+            prompt: Input prompt text, or a list of prompts for a batched request
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature (0.0 to 2.0)
             top_p: Nucleus sampling parameter
             stop: List of stop sequences
+            guided_json: JSON schema the output must conform to (vLLM guided decoding)
             **kwargs: Additional parameters for vLLM API
 
         Returns:
@@ -121,9 +178,13 @@ class VLLMClient:
         if stop:
             request_data["stop"] = stop
 
+        if guided_json:
+            # vLLM extra param; the pinned server image (see Dockerfile) accepts it
+            request_data["guided_json"] = guided_json
+
         logger.debug(
-            f"Calling completions API: model={model}, "
-            f"max_tokens={max_tokens}, temp={temperature}"
+            "Calling completions API: model={}, max_tokens={}, temp={}",
+            model, max_tokens, temperature
         )
 
         try:
@@ -132,7 +193,7 @@ class VLLMClient:
                 json=request_data
             )
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
 
             tokens_used = result.get("usage", {}).get("total_tokens", 0)
             logger.info(f"Completions API success: {tokens_used} tokens used")
@@ -147,6 +208,94 @@ class VLLMClient:
             logger.error(f"Completions API failed: {e}")
             raise
 
+    async def completions_stream(
+        self,
+        model: str,
+        prompt: str,
+        max_tokens: int = 512,
+        temperature: float = 0.3,
+        top_p: float = 1.0,
+        stop: Optional[List[str]] = None,
+        guided_json: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Call vLLM completions API with streaming enabled.
+
+        Yields each server-sent event chunk as it arrives, each carrying the running
+        'usage' (requested via stream_options). Closing the generator early closes
+        the upstream connection, which makes vLLM abort the remaining generation.
+
+        Args:
+            model: Model name (e.g., "medical-ie" for LoRA adapter)
+            prompt: Input prompt text
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0 to 2.0)
+            top_p: Nucleus sampling parameter
+            stop: List of stop sequences
+            guided_json: JSON schema the output must conform to (vLLM guided decoding)
+            **kwargs: Additional parameters for vLLM API
+
+        Yields:
+            Parsed completion chunks with 'choices' (text deltas) and/or 'usage'
+
+        Raises:
+            httpx.HTTPStatusError: If API returns error status
+
+        Example:
+            >>> client = VLLMClient()
+            >>> async for chunk in client.completions_stream(model="medical-ie", prompt="..."):
+            ...     print(chunk["choices"][0]["text"], end="")
+        """
+        request_data = {
+            "model": model,
+            "prompt": prompt,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "stream": True,
+            # vLLM extension: report running usage on every chunk, so the count is
+            # still known if the caller stops reading early
+            "stream_options": {"include_usage": True, "continuous_usage_stats": True},
+            **kwargs
+        }
+
+        if stop:
+            request_data["stop"] = stop
+
+        if guided_json:
+            # vLLM extra param; the pinned server image (see Dockerfile) accepts it
+            request_data["guided_json"] = guided_json
+
+        logger.debug(
+            "Calling streaming completions API: model={}, max_tokens={}, temp={}",
+            model, max_tokens, temperature
+        )
+
+        try:
+            async with self.client.stream(
+                "POST", f"{self.base_url}/v1/completions", json=request_data
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    yield orjson.loads(data)
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"Streaming completions API HTTP error: {e.response.status_code} - {e.response.text}"
+            )
+            raise
+        except httpx.HTTPError as e:
+            logger.error(f"Streaming completions API failed: {e}")
+            raise
+
     async def chat_completions(
         self,
         model: str,
@@ -199,8 +348,8 @@ class VLLMClient:
             request_data["stop"] = stop
 
         logger.debug(
-            f"Calling chat completions API: model={model}, "
-            f"messages={len(messages)}, max_tokens={max_tokens}"
+            "Calling chat completions API: model={}, messages={}, max_tokens={}",
+            model, len(messages), max_tokens
         )
 
         try:
@@ -209,7 +358,7 @@ class VLLMClient:
                 json=request_data
             )
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
 
             tokens_used = result.get("usage", {}).get("total_tokens", 0)
             logger.info(f"Chat completions API success: {tokens_used} tokens used")
@@ -223,3 +372,308 @@ class VLLMClient:
         except httpx.HTTPError as e:
             logger.error(f"Chat completions API failed: {e}")
             raise
+
+
+class BatchScheduler:
+    """
+    Dynamic micro-batcher for vLLM completions requests.
+
+    Concurrent completion requests arriving within a short window are coalesced
+    into a single multi-prompt call to /v1/completions (vLLM accepts a list for
+    `prompt`), and the per-choice results, each with its own exact usage, are
+    fanned back out to each caller. Only requests with identical sampling
+    parameters share a batch; anything else is dispatched on its own through the
+    single-prompt path.
+
+    Attributes:
+        client: VLLMClient used to issue the batched requests
+        max_batch_size: Maximum number of prompts per vLLM call
+        max_latency_ms: Maximum time to wait for a batch to fill up
+    """
+
+    def __init__(
+        self, client: VLLMClient, max_batch_size: int = 32, max_latency_ms: float = 10.0
+    ):
+        """
+        Initialize batch scheduler.
+
+        Args:
+            client: VLLMClient used to issue the batched requests
+            max_batch_size: Maximum number of prompts per vLLM call
+            max_latency_ms: Maximum time (ms) the first queued request waits for others
+        """
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Strong references to in-flight dispatches (the event loop only keeps weak ones)
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        """Whether the background batching task is active."""
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self):
+        """Start the background batching task (called from the app lifespan)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"BatchScheduler started: max_batch_size={self.max_batch_size}, "
+            f"max_latency_ms={self.max_latency_ms}"
+        )
+
+    async def stop(self):
+        """Stop the background task and fail every request that has not completed yet."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        # Each cancelled dispatch fails its own unresolved futures (see _dispatch)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+        while self._queue is not None and not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("scheduler stopped"))
+        logger.info("BatchScheduler stopped")
+
+    async def submit(
+        self,
+        model: str,
+        prompt: str,
+        max_tokens: int = 512,
+        temperature: float = 0.3,
+        top_p: float = 1.0,
+        stop: Optional[List[str]] = None,
+        guided_json: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Queue a single completion request for batched execution.
+
+        Falls back to a direct completions call when the scheduler is not running.
+
+        Args:
+            model: Model name (e.g., "medical-ie" for LoRA adapter)
+            prompt: Input prompt text
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0 to 2.0)
+            top_p: Nucleus sampling parameter
+            stop: List of stop sequences
+            guided_json: JSON schema the output must conform to (vLLM guided decoding)
+
+        Returns:
+            Completions response shaped like a single-prompt call: one entry in
+            'choices' plus 'usage'
+        """
+        if not self.running:
+            return await self.client.completions(
+                model=model,
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                stop=stop,
+                guided_json=guided_json,
+            )
+
+        # The schema is serialized so it can take part in the hashable grouping key
+        params = (
+            model,
+            max_tokens,
+            temperature,
+            top_p,
+            tuple(stop) if stop else None,
+            orjson.dumps(guided_json, option=orjson.OPT_SORT_KEYS) if guided_json else None,
+        )
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((prompt, params, future))
+        return await future
+
+    async def _run(self):
+        """Background loop: collect a batch, group by sampling params, dispatch."""
+        loop = asyncio.get_running_loop()
+        max_latency = self.max_latency_ms / 1000
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + max_latency
+
+            try:
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Requests already pulled off the queue would otherwise never resolve
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("scheduler stopped"))
+                raise
+
+            groups: Dict[tuple, List[tuple]] = {}
+            for prompt, params, future in batch:
+                groups.setdefault(params, []).append((prompt, future))
+
+            for params, items in groups.items():
+                task = asyncio.create_task(self._dispatch(params, items))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, params: tuple, items: List[tuple]):
+        """
+        Send one vLLM request for a group of prompts and resolve their futures.
+
+        Args:
+            params: (model, max_tokens, temperature, top_p, stop, guided_json) shared by
+                    the group, with guided_json as serialized JSON bytes
+            items: List of (prompt, future) pairs
+        """
+        model, max_tokens, temperature, top_p, stop, guided_json = params
+        request = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "stop": list(stop) if stop else None,
+            "guided_json": orjson.loads(guided_json) if guided_json else None,
+        }
+
+        try:
+            if len(items) == 1:
+                await self._complete_one(request, *items[0])
+            else:
+                await self._complete_batch(request, items)
+        finally:
+            # Only reached with unresolved futures when the dispatch is cancelled
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(RuntimeError("scheduler stopped"))
+
+    async def _complete_one(
+        self, request: Dict[str, Any], prompt: str, future: "asyncio.Future"
+    ):
+        """
+        Resolve one future from a single-prompt completions call.
+
+        Args:
+            request: Sampling parameters shared by the group
+            prompt: Prompt text for this caller
+            future: Caller's future
+        """
+        try:
+            result = await self.client.completions(prompt=prompt, **request)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    async def _complete_batch(self, request: Dict[str, Any], items: List[tuple]):
+        """
+        Resolve a group of futures from one multi-prompt completions call.
+
+        The call is streamed because vLLM reports per-prompt usage only on stream
+        chunks (continuous usage stats); a non-streaming response carries the batch
+        total alone. If vLLM rejects the request (4xx), or a prompt's output or usage
+        is incomplete, those prompts are re-sent on their own, so an error only ever
+        reaches the caller whose prompt caused it.
+
+        Args:
+            request: Sampling parameters shared by the group
+            items: List of (prompt, future) pairs
+        """
+        texts: List[List[str]] = [[] for _ in items]
+        finished: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        usage: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        header: Dict[str, Any] = {}
+
+        stream = self.client.completions_stream(prompt=[prompt for prompt, _ in items], **request)
+        try:
+            async for chunk in stream:
+                for choice in chunk.get("choices", []):
+                    i = choice["index"]
+                    texts[i].append(choice.get("text", ""))
+                    if chunk.get("usage"):
+                        usage[i] = chunk["usage"]
+                    if choice.get("finish_reason") is not None:
+                        finished[i] = choice
+                        header = chunk
+        except httpx.HTTPStatusError as e:
+            if not e.response.is_client_error:
+                self._fail(items, e)
+                return
+            logger.warning("Batched completions call rejected, re-sending {} prompts", len(items))
+            await asyncio.gather(*(self._complete_one(request, *item) for item in items))
+            return
+        except Exception as e:
+            self._fail(items, e)
+            return
+        finally:
+            await stream.aclose()
+
+        logger.debug("Batched {} prompts into one completions call", len(items))
+
+        retry = []
+        for i, (prompt, future) in enumerate(items):
+            if future.done():
+                continue
+            if finished[i] is None or usage[i] is None:
+                retry.append((prompt, future))
+                continue
+            choice = {**finished[i], "index": 0, "text": "".join(texts[i])}
+            result = {key: header[key] for key in ("id", "object", "created", "model") if key in header}
+            future.set_result({**result, "choices": [choice], "usage": usage[i]})
+
+        if retry:
+            logger.warning("Incomplete batched output, re-sending {} prompts", len(retry))
+            await asyncio.gather(*(self._complete_one(request, *item) for item in retry))
+
+    @staticmethod
+    def _fail(items: List[tuple], error: Exception):
+        """Fail every unresolved future in a group with a shared (non prompt-specific) error."""
+        for _, future in items:
+            if not future.done():
+                future.set_exception(error)
+
+
+def get_vllm(request: Request) -> VLLMClient:
+    """
+    FastAPI dependency returning the shared VLLMClient created in the app lifespan.
+
+    Args:
+        request: Incoming request (provides access to app.state)
+
+    Returns:
+        Shared VLLMClient instance
+    """
+    return request.app.state.vllm
+
+
+def get_batch_scheduler(request: Request) -> BatchScheduler:
+    """
+    FastAPI dependency returning the shared BatchScheduler created in the app lifespan.
+
+    Args:
+        request: Incoming request (provides access to app.state)
+
+    Returns:
+        Shared BatchScheduler instance
+    """
+    return request.app.state.batch_scheduler
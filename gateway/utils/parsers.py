@@ -5,16 +5,36 @@ Implements robust parsing for vLLM model outputs:
 - extract_first_json: Extract first valid JSON object from text
 - parse_key_value_format: Fallback parser for key:value format
 - parse_medical_output: Main parser with multi-layer fallback strategy
+- JsonObjectTracker: Detect the end of the first JSON object in streamed output
+
+Fully type-annotated so the gateway image can compile it with mypyc
+(see gateway/Dockerfile); the pure-Python module is used when no compiled
+extension is present.
 """
 
-import json
 import re
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
+import orjson
 from loguru import logger
 
+# Brace positions are located by the regex engine rather than a per-character loop
+_BRACES = re.compile(rb"[{}]")
+
+# Markdown code fences (with or without language specifier) stripped by clean_json_string
+_MD_OPEN = re.compile(r"```(?:json)?\s*\n?")
+_MD_CLOSE = re.compile(r"```\s*$")
+
+# One "key: value" line per match for the known medical fields ("Cancer Type" and
+# "cancer_type" are both accepted, as keys are normalized to snake_case)
+_KV_RE = re.compile(
+    r"^[ \t]*(cancer[ _]type|stage|gene[ _]mutation|biomarker|treatment|response"
+    r"|metastasis[ _]site)[ \t]*:[ \t]*(.*?)\s*$",
+    re.MULTILINE | re.IGNORECASE,
+)
 
-def extract_first_json(text: str) -> Optional[Dict]:
+
+def extract_first_json(text: str) -> Optional[Dict[str, Any]]:
     """
     Extract first valid JSON object from text with proper brace matching.
 
@@ -32,23 +52,25 @@ def extract_first_json(text: str) -> Optional[Dict]:
         >>> extract_first_json(text)
         {'cancer_type': 'lung cancer'}
     """
-    brace_count = 0
-    start_idx = text.find("{")
+    buf = text.encode("utf-8")
+    start_idx = buf.find(b"{")
 
     if start_idx == -1:
         return None
 
-    for i in range(start_idx, len(text)):
-        if text[i] == "{":
+    brace_count = 0
+    for match in _BRACES.finditer(buf, start_idx):
+        if match.group() == b"{":
             brace_count += 1
-        elif text[i] == "}":
+        else:
             brace_count -= 1
             if brace_count == 0:
-                # Found complete JSON object
-                json_str = text[start_idx : i + 1]
+                # Found complete JSON object (orjson parses the bytes slice directly)
+                json_bytes = buf[start_idx : match.end()]
                 try:
-                    return json.loads(json_str)
-                except json.JSONDecodeError as e:
+                    parsed: Dict[str, Any] = orjson.loads(json_bytes)
+                    return parsed
+                except orjson.JSONDecodeError as e:
                     logger.warning(f"JSON decode error: {e}")
                     return None
 
@@ -56,6 +78,55 @@ def extract_first_json(text: str) -> Optional[Dict]:
     return None
 
 
+class JsonObjectTracker:
+    """
+    Incremental brace matcher for streamed model output.
+
+    Applies the same brace counting as extract_first_json to text that arrives in
+    chunks, so a stream can be cut off as soon as the first JSON object closes.
+
+    Attributes:
+        depth: Current brace nesting depth
+        complete: Whether the first top-level object has closed
+    """
+
+    def __init__(self) -> None:
+        """Initialize tracker before any output has been seen."""
+        self.depth: int = 0
+        self.complete: bool = False
+
+    def feed(self, chunk: str) -> int:
+        """
+        Consume the next chunk of streamed text.
+
+        Args:
+            chunk: Text delta from the model
+
+        Returns:
+            Index in `chunk` just past the closing brace of the first object if it
+            closes within this chunk, -1 otherwise
+
+        Example:
+            >>> tracker = JsonObjectTracker()
+            >>> tracker.feed('{"stage": ')
+            -1
+            >>> tracker.feed('"3"} trailing')
+            4
+        """
+        if self.complete:
+            return -1
+
+        for i, char in enumerate(chunk):
+            if char == "{":
+                self.depth += 1
+            elif char == "}" and self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete = True
+                    return i + 1
+        return -1
+
+
 def parse_key_value_format(text: str) -> Dict[str, str]:
     """
     Fallback parser for key:value format when JSON parsing fails.
@@ -76,35 +147,20 @@ def parse_key_value_format(text: str) -> Dict[str, str]:
         >>> parse_key_value_format(text)
         {'cancer_type': 'lung cancer', 'stage': 'IV'}
     """
-    fields = {}
-    valid_keys = {
-        "cancer_type",
-        "stage",
-        "gene_mutation",
-        "biomarker",
-        "treatment",
-        "response",
-        "metastasis_site",
+    return {
+        match.group(1).lower().replace(" ", "_"): match.group(2) for match in _KV_RE.finditer(text)
     }
 
-    for line in text.split("\n"):
-        if ":" in line:
-            key, value = line.split(":", 1)
-            key = key.strip().lower().replace(" ", "_")
-            if key in valid_keys:
-                fields[key] = value.strip()
-
-    return fields
-
 
 def parse_medical_output(text: str) -> Dict[str, Optional[str]]:
     """
     Main parser for medical entity extraction with multi-layer fallback.
 
     Parsing strategy:
-    1. Try extracting first JSON object (primary method)
-    2. Fall back to key:value parsing if JSON fails
-    3. Return empty dict with all None values if both fail
+    1. Parse the whole output as JSON (schema-constrained generation emits bare JSON)
+    2. Try extracting first JSON object from surrounding text
+    3. Fall back to key:value parsing if JSON fails
+    4. Return empty dict with all None values if all fail
 
     Args:
         text: Raw model output
@@ -128,8 +184,16 @@ def parse_medical_output(text: str) -> Dict[str, Optional[str]]:
         "metastasis_site": None,
     }
 
-    # Layer 1: Try JSON extraction
-    json_obj = extract_first_json(text)
+    # Layer 1: Direct parse (fast path for guided_json output)
+    try:
+        json_obj: Any = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        json_obj = None
+
+    # Layer 2: Try JSON extraction from surrounding text
+    if not isinstance(json_obj, dict):
+        json_obj = extract_first_json(text)
+
     if json_obj:
         logger.debug("Successfully parsed JSON output")
         # Only update fields that exist in the JSON
@@ -138,15 +202,15 @@ def parse_medical_output(text: str) -> Dict[str, Optional[str]]:
                 result[key] = json_obj[key]
         return result
 
-    # Layer 2: Try key:value parsing
+    # Layer 3: Try key:value parsing
     logger.debug("JSON parsing failed, trying key:value format")
     kv_fields = parse_key_value_format(text)
     if kv_fields:
-        logger.debug(f"Parsed {len(kv_fields)} fields from key:value format")
+        logger.debug("Parsed {} fields from key:value format", len(kv_fields))
         result.update(kv_fields)
         return result
 
-    # Layer 3: Return empty result
+    # Layer 4: Return empty result
     logger.warning("All parsing methods failed, returning empty result")
     return result
 
@@ -170,11 +234,5 @@ def clean_json_string(text: str) -> str:
         >>> clean_json_string('```json\\n{"key": "value"}\\n```')
         '{"key": "value"}'
     """
-    # Remove markdown code blocks (with or without language specifier)
-    text = re.sub(r"```(?:json)?\s*\n?", "", text)
-    text = re.sub(r"```\s*$", "", text)
-
-    # Remove extra whitespace
-    text = text.strip()
-
-    return text
+    # Remove markdown code blocks, then extra whitespace
+    return _MD_CLOSE.sub("", _MD_OPEN.sub("", text)).strip()
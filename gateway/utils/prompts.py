@@ -1,9 +1,53 @@
 """
 Prompt templates for medical information extraction.
+
+All templates place static instructions first and the caller's text last, so
+the instruction tokens form a shared prefix that vLLM's automatic prefix caching
+can reuse across requests. Keep new templates in that shape and free of
+per-request values (timestamps, IDs) ahead of the text.
 """
 
 from typing import Optional
 
+# Simplified prompt format that matches the training data better.
+# Kept as constants so every request shares byte-identical text around the clinical
+# input, which lets vLLM's automatic prefix caching reuse KV for the prefix.
+_PROMPT_PREFIX = (
+    "Extract cancer information from this text and output as JSON with these fields: "
+    "cancer_type, stage, gene_mutation, biomarker, treatment, response, metastasis_site."
+    "\n\nText: "
+)
+_PROMPT_SUFFIX = "\n\nJSON:"
+
+# Chat system message, shared by every chat_extraction_prompt call. Kept a plain
+# dict so it serializes with the request body; treat it as read-only.
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": """You are a medical information extraction assistant. Your task is to extract structured cancer-related information from clinical text.
+
+Extract these fields when present:
+- cancer_type: Type of cancer
+- stage: Cancer stage
+- gene_mutation: Genetic mutations
+- biomarker: Biomarkers/molecular markers
+- treatment: Treatment approaches
+- response: Treatment response
+- metastasis_site: Metastasis sites
+
+Return results as a JSON object. If a field is not mentioned, omit it or use null.""",
+}
+_CHAT_USER_PREFIX = "Extract structured cancer information from this text:\n\n"
+
+# Validation prompt pieces, joined around the original text and extracted fields
+_VALIDATION_HEAD = (
+    "Verify that the following extracted information is accurate based on the original text."
+    "\n\nOriginal Text:\n"
+)
+_VALIDATION_MID = "\n\nExtracted Data:\n"
+_VALIDATION_TAIL = (
+    '\n\nIs this extraction accurate? Respond with "yes" or "no" and explain any discrepancies.'
+)
+
 
 def medical_extraction_prompt(text: str, format_hint: bool = True) -> str:
     """
@@ -11,7 +55,8 @@ def medical_extraction_prompt(text: str, format_hint: bool = True) -> str:
 
     Args:
         text: Clinical text to extract information from
-        format_hint: Whether to include JSON format hint in the prompt
+        format_hint: Accepted for API compatibility; the field list in the prefix
+            already serves as the format hint, so output is the same either way
 
     Returns:
         Formatted prompt string for the model
@@ -19,16 +64,9 @@ def medical_extraction_prompt(text: str, format_hint: bool = True) -> str:
     Example:
         >>> prompt = medical_extraction_prompt("Patient has stage 3 breast cancer")
         >>> print(prompt)
-        Extract structured cancer information from this clinical text...
+        Extract cancer information from this text and output as JSON with these fields: ...
     """
-    # Simplified prompt format that matches the training data better
-    base_prompt = f"""Extract cancer information from this text and output as JSON with these fields: cancer_type, stage, gene_mutation, biomarker, treatment, response, metastasis_site.
-
-Text: {text}
-
-JSON:"""
-
-    return base_prompt
+    return _PROMPT_PREFIX + text + _PROMPT_SUFFIX
 
 
 def chat_extraction_prompt(text: str) -> list[dict[str, str]]:
@@ -39,33 +77,18 @@ def chat_extraction_prompt(text: str) -> list[dict[str, str]]:
         text: Clinical text to extract information from
 
     Returns:
-        List of message dicts with 'role' and 'content' keys
+        List of message dicts with 'role' and 'content' keys (the system
+        message dict is shared between calls and must not be mutated)
 
     Example:
         >>> messages = chat_extraction_prompt("Patient diagnosed with lung cancer")
         >>> print(messages[0]['role'])
         system
     """
-    system_message = """You are a medical information extraction assistant. Your task is to extract structured cancer-related information from clinical text.
-
-Extract these fields when present:
-- cancer_type: Type of cancer
-- stage: Cancer stage
-- gene_mutation: Genetic mutations
-- biomarker: Biomarkers/molecular markers
-- treatment: Treatment approaches
-- response: Treatment response
-- metastasis_site: Metastasis sites
-
-Return results as a JSON object. If a field is not mentioned, omit it or use null."""
-
-    user_message = f"""Extract structured cancer information from this text:
-
-{text}"""
-
+    # A fresh list per call: callers may append follow-up turns
     return [
-        {"role": "system", "content": system_message},
-        {"role": "user", "content": user_message}
+        _SYSTEM_MESSAGE,
+        {"role": "user", "content": _CHAT_USER_PREFIX + text}
     ]
 
 
@@ -84,14 +107,49 @@ def validation_prompt(extracted_data: dict[str, Optional[str]], original_text: s
         >>> data = {"cancer_type": "breast cancer", "stage": "3"}
         >>> prompt = validation_prompt(data, "Patient has stage 3 breast cancer")
     """
-    fields_str = "\n".join([f"- {k}: {v}" for k, v in extracted_data.items() if v])
+    fields_str = "\n".join(f"- {k}: {v}" for k, v in extracted_data.items() if v)
+
+    return "".join((_VALIDATION_HEAD, original_text, _VALIDATION_MID, fields_str, _VALIDATION_TAIL))
+
+
+def build_medical_prompts(texts: list[str], format_hint: bool = True) -> list[str]:
+    """
+    Create extraction prompts for a batch of clinical texts.
+
+    The result can be passed straight to VLLMClient.completions, which sends a
+    list prompt as one request so vLLM schedules the batch together.
+
+    Args:
+        texts: Clinical texts to extract information from
+        format_hint: Same meaning as for medical_extraction_prompt
+
+    Returns:
+        Prompts in the same order as `texts`
+
+    Example:
+        >>> prompts = build_medical_prompts(["Stage IV lung cancer", "HER2+ breast cancer"])
+        >>> len(prompts)
+        2
+    """
+    return [_PROMPT_PREFIX + text + _PROMPT_SUFFIX for text in texts]
+
 
-    return f"""Verify that the following extracted information is accurate based on the original text.
+def build_chat_prompts(texts: list[str]) -> list[list[dict[str, str]]]:
+    """
+    Create chat-style extraction messages for a batch of clinical texts.
 
-Original Text:
-{original_text}
+    Args:
+        texts: Clinical texts to extract information from
 
-Extracted Data:
-{fields_str}
+    Returns:
+        One message list per text, each sharing the same system message dict
 
-Is this extraction accurate? Respond with "yes" or "no" and explain any discrepancies."""
+    Example:
+        >>> batch = build_chat_prompts(["Patient diagnosed with lung cancer"])
+        >>> batch[0][1]['role']
+        'user'
+    """
+    return [
+        [_SYSTEM_MESSAGE, {"role": "user", "content": _CHAT_USER_PREFIX + text}]
+        for text in texts
+    ]
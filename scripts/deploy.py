@@ -27,15 +27,27 @@ Prerequisites:
 
 import sys
 import time
+import base64
+import hashlib
+import shlex
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 import boto3
 import yaml
 from loguru import logger
 from botocore.exceptions import ClientError, WaiterError
 
+# libyaml-backed loader when PyYAML was built with it (same safe semantics, C speed)
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Configure loguru
 logger.remove()  # Remove default handler
 logger.add(
@@ -49,28 +61,67 @@ logger.add(
 logger.level("INFO", color="<blue>")
 
 
+def _load_script(name: str) -> Tuple[str, str]:
+    """Read an on-instance script next to this file, split into (shebang, body)"""
+    header, body = (Path(__file__).parent / name).read_text(encoding='utf-8').split('\n', 1)
+    return header, body
+
+
+def _render_script(script: Tuple[str, str], env: Dict[str, str]) -> str:
+    """Prepend shell-quoted exports for `env` to a static script, after its shebang"""
+    header, body = script
+    exports = "".join(f"export {name}={shlex.quote(value)}\n" for name, value in env.items())
+    return f"{header}\n{exports}{body}"
+
+
+# Static on-instance scripts; per-deploy values are prepended as exports
+_DEPLOY_SCRIPT = _load_script('deploy_stack.sh')
+_RESTART_SCRIPT = _load_script('restart_stack.sh')
+
+
+@lru_cache(maxsize=4)
+def _load_compose_b64(path: Path, mtime_ns: int) -> str:
+    """Read a compose file and base64-encode it (cached until its mtime changes)"""
+    return base64.b64encode(path.read_bytes()).decode('ascii')
+
+
+@lru_cache(maxsize=4)
+def _read_config(config_path: Path, stamp: Tuple[int, int]) -> Dict[str, Any]:
+    """
+    Parse a deployment config, keyed by path and (mtime_ns, size).
+    
+    Parsed configs are shared between DeploymentConfig instances in this process;
+    treat the result as read-only.
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
 class DeploymentConfig:
     """Load and manage deployment configuration"""
     
     def __init__(self, config_path: Path):
         self.config_path = config_path
         self.config = self._load_config()
-        self.ssm_client = boto3.client('ssm', region_name=self._get_region())
+        # One session: the credential chain is resolved once and clients share it
+        self.session = boto3.Session()
+        self._region_name = self._get_region()
         self._resolve_ssm_parameters()
     
     def _load_config(self) -> Dict[str, Any]:
-        """Load deployment configuration from YAML file"""
+        """Load deployment configuration from YAML file (via a parse cache)"""
         logger.info(f"Loading configuration from {self.config_path}")
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        stat = self.config_path.stat()
+        return _read_config(self.config_path, (stat.st_mtime_ns, stat.st_size))
     
     def _get_region(self) -> str:
         """Get AWS region from SSM parameter"""
+        self._bootstrap_ssm = None
         try:
             # Try to get from SSM first
             region_param = self.config['aws']['region']
-            temp_client = boto3.client('ssm', region_name='us-east-1')  # Default region for bootstrap
-            response = temp_client.get_parameter(Name=region_param)
+            self._bootstrap_ssm = self.session.client('ssm', region_name='us-east-1')  # Default region for bootstrap
+            response = self._bootstrap_ssm.get_parameter(Name=region_param)
             return response['Parameter']['Value']
         except Exception as e:
             logger.warning(f"Could not retrieve region from SSM: {e}")
@@ -81,39 +132,83 @@ class DeploymentConfig:
         """Resolve SSM parameter references to actual values"""
         logger.info("Resolving SSM parameters...")
         
-        # Resolve instance_id
         instance_id_param = self.config['ec2']['instance_id']
-        response = self.ssm_client.get_parameter(Name=instance_id_param)
-        self.instance_id = response['Parameter']['Value']
+        hf_token_param = self.config['secrets']['hf_token']
+        
+        # One batched SSM round-trip; the STS lookup (for the ECR registry) overlaps it
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            account_future = executor.submit(self.sts.get_caller_identity)
+            response = self.ssm.get_parameters(
+                Names=[instance_id_param, hf_token_param]
+            )
+            identity = account_future.result()
+        
+        invalid = response.get('InvalidParameters')
+        if invalid:
+            raise ValueError(f"SSM parameters not found: {invalid}")
+        values = {p['Name']: p['Value'] for p in response['Parameters']}
+        
+        # Resolve instance_id
+        self.instance_id = values[instance_id_param]
         logger.info(f"Instance ID: {self.instance_id}")
         
         # Resolve hf_token reference (Secrets Manager name)
-        hf_token_param = self.config['secrets']['hf_token']
-        response = self.ssm_client.get_parameter(Name=hf_token_param)
-        self.hf_token_secret_name = response['Parameter']['Value']
+        self.hf_token_secret_name = values[hf_token_param]
         logger.info(f"HF Token Secret: {self.hf_token_secret_name}")
         
         # Get AWS account ID for ECR registry
-        sts_client = boto3.client('sts', region_name=self.region)
-        self.account_id = sts_client.get_caller_identity()['Account']
+        self.account_id = identity['Account']
         logger.info(f"AWS Account ID: {self.account_id}")
     
-    @property
+    @cached_property
+    def ssm(self):
+        """SSM client for the deployment region"""
+        # Reuse the bootstrap client (and its open connection) when regions match
+        if self._bootstrap_ssm is not None and self._bootstrap_ssm.meta.region_name == self._region_name:
+            return self._bootstrap_ssm
+        return self.session.client('ssm', region_name=self._region_name)
+    
+    @cached_property
+    def ec2(self):
+        """EC2 client for the deployment region"""
+        return self.session.client('ec2', region_name=self._region_name)
+    
+    @cached_property
+    def sts(self):
+        """STS client for the deployment region"""
+        return self.session.client('sts', region_name=self._region_name)
+    
+    @cached_property
+    def logs(self):
+        """CloudWatch Logs client for the deployment region"""
+        return self.session.client('logs', region_name=self._region_name)
+    
+    @cached_property
+    def secretsmanager(self):
+        """Secrets Manager client for the deployment region"""
+        return self.session.client('secretsmanager', region_name=self._region_name)
+    
+    @cached_property
+    def s3(self):
+        """S3 client (compose file staging)"""
+        return self.session.client('s3', region_name=self._region_name)
+    
+    @cached_property
     def region(self) -> str:
         """Get AWS region"""
-        return self.ssm_client.meta.region_name
+        return self.ssm.meta.region_name
     
-    @property
+    @cached_property
     def ecr_registry(self) -> str:
         """Construct ECR registry URL"""
         return f"{self.account_id}.dkr.ecr.{self.region}.amazonaws.com"
     
-    @property
+    @cached_property
     def ecr_vllm_repository(self) -> str:
         """Get vLLM ECR repository name"""
         return self.config['ecr']['vllm_repository']
     
-    @property
+    @cached_property
     def ecr_gateway_repository(self) -> str:
         """Get gateway ECR repository name"""
         return self.config['ecr']['gateway_repository']
@@ -123,8 +218,9 @@ def start_ec2_instance(config: DeploymentConfig) -> bool:
     """Start EC2 instance and wait for status OK"""
     logger.info(f"Starting EC2 instance: {config.instance_id}")
     
-    ec2_client = boto3.client('ec2', region_name=config.region)
+    ec2_client = config.ec2
     timeout = config.config['deployment']['ec2_start_timeout_seconds']
+    poll_delay = config.config['deployment']['ec2_status_poll_delay_seconds']
     
     try:
         # Check current instance state
@@ -141,23 +237,15 @@ def start_ec2_instance(config: DeploymentConfig) -> bool:
             logger.warning(f"Instance in unexpected state: {state}")
             return False
         
-        # Wait for instance to be running
-        logger.info("Waiting for instance to reach 'running' state...")
-        waiter = ec2_client.get_waiter('instance_running')
-        waiter.wait(
-            InstanceIds=[config.instance_id],
-            WaiterConfig={'Delay': 15, 'MaxAttempts': timeout // 15}
-        )
-        logger.success("Instance is running")
-        
-        # Wait for status checks to pass
-        logger.info("Waiting for status checks to pass...")
+        # Wait for status checks to pass (only reported once the instance is running,
+        # so a separate instance_running wait is not needed)
+        logger.info("Waiting for instance to run and pass status checks...")
         waiter = ec2_client.get_waiter('instance_status_ok')
         waiter.wait(
             InstanceIds=[config.instance_id],
-            WaiterConfig={'Delay': 15, 'MaxAttempts': timeout // 15}
+            WaiterConfig={'Delay': poll_delay, 'MaxAttempts': timeout // poll_delay}
         )
-        logger.success("Instance status checks passed")
+        logger.success("Instance is running and status checks passed")
         
         return True
         
@@ -169,10 +257,172 @@ def start_ec2_instance(config: DeploymentConfig) -> bool:
         return False
 
 
+class CommandLogTailer(threading.Thread):
+    """Print an SSM command's CloudWatch output (stdout and stderr) as it arrives"""
+    
+    def __init__(self, config: DeploymentConfig, log_group: str, command_id: str, poll_seconds: float = 2.0):
+        super().__init__(daemon=True)
+        self.logs_client = config.logs
+        self.log_group = log_group
+        # SSM names the streams "<command-id>/<instance-id>/<plugin>/stdout|stderr"
+        self.stream_prefix = f"{command_id}/{config.instance_id}"
+        self.poll_seconds = poll_seconds
+        self.start_time = int(time.time() * 1000)
+        self.events_seen = 0
+        self._seen_ids = set()
+        self._stop_event = threading.Event()
+    
+    def stop(self, grace_seconds: float = 3.0):
+        """Wake the tailer for one final read and wait at most `grace_seconds` for it"""
+        self._stop_event.set()
+        self.join(timeout=grace_seconds)
+    
+    def run(self):
+        while True:
+            finished = self._stop_event.is_set()
+            self._print_new_events()
+            if finished:
+                return
+            self._stop_event.wait(self.poll_seconds)
+    
+    def _print_new_events(self):
+        paginator = self.logs_client.get_paginator('filter_log_events')
+        try:
+            for page in paginator.paginate(
+                logGroupName=self.log_group,
+                logStreamNamePrefix=self.stream_prefix,
+                startTime=self.start_time
+            ):
+                for event in page['events']:
+                    if event['eventId'] in self._seen_ids:
+                        continue
+                    self._seen_ids.add(event['eventId'])
+                    self.events_seen += 1
+                    # Re-query from the newest timestamp; seen IDs filter the overlap
+                    self.start_time = max(self.start_time, event['timestamp'])
+                    print(event['message'].rstrip('\n'), flush=True)
+        except ClientError as e:
+            # The log streams do not exist until the command first writes output
+            if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                logger.warning(f"Could not read command logs: {e}")
+
+
+def _upload_compose(config: DeploymentConfig, bucket: str, compose_file: Path) -> Optional[str]:
+    """
+    Upload the compose file to S3 under a content-addressed key.
+    
+    Skips the upload when an object with the same content hash already exists.
+    
+    Returns:
+        Object key if the file is in S3, None on failure
+    """
+    content = compose_file.read_bytes()
+    key = f"deploy/docker-compose-{hashlib.sha256(content).hexdigest()}.yml"
+    
+    try:
+        config.s3.head_object(Bucket=bucket, Key=key)
+        logger.info(f"Compose file already in S3: s3://{bucket}/{key}")
+    except ClientError as e:
+        if e.response['Error']['Code'] not in ('404', 'NoSuchKey', 'NotFound'):
+            logger.error(f"Failed to check compose file in S3: {e}")
+            return None
+        try:
+            config.s3.put_object(Bucket=bucket, Key=key, Body=content)
+        except ClientError as e:
+            logger.error(f"Failed to upload compose file to S3: {e}")
+            return None
+        logger.info(f"Uploaded compose file to s3://{bucket}/{key}")
+    return key
+
+
+def _validation_env(config: DeploymentConfig, validate: bool) -> Dict[str, str]:
+    """Script variables controlling the in-command health wait"""
+    return {
+        'VALIDATE': '1' if validate else '0',
+        'WAIT_TIMEOUT': str(config.config['deployment']['health_check_timeout_seconds']),
+        'GATEWAY_PORT': str(config.config['gateway']['api_port']),
+    }
+
+
+def _current_secret_version(config: DeploymentConfig, secret_id: str) -> str:
+    """
+    Look up the AWSCURRENT version ID of a secret (metadata only, no secret value).
+    
+    Returns:
+        Version ID, or "" if it cannot be read (the instance then always fetches)
+    """
+    try:
+        response = config.secretsmanager.describe_secret(SecretId=secret_id)
+    except ClientError as e:
+        logger.warning(f"Could not read secret version, token will not be cached: {e}")
+        return ""
+    
+    for version_id, stages in response.get('VersionIdsToStages', {}).items():
+        if 'AWSCURRENT' in stages:
+            return version_id
+    return ""
+
+
+def _stack_env(config: DeploymentConfig) -> Dict[str, str]:
+    """Variables docker-compose.yml interpolates (or the scripts need to resolve them)"""
+    return {
+        'HF_SECRET': config.hf_token_secret_name,
+        'HF_SECRET_VERSION': _current_secret_version(config, config.hf_token_secret_name),
+        'REGION': config.region,
+        'ECR_REGISTRY': config.ecr_registry,
+        'CORS_ORIGINS': config.config['gateway']['cors_origins'],
+    }
+
+
+def _build_deploy_script(
+    config: DeploymentConfig,
+    image_tag: str,
+    force_redeploy: bool,
+    validate: bool
+) -> Optional[str]:
+    """
+    Render the full deploy script (deploy_stack.sh) for this config.
+    
+    Returns:
+        Script text, or None if docker-compose.yml could not be staged
+    """
+    # Read docker-compose.yml from project root
+    script_dir = Path(__file__).parent
+    compose_file = script_dir.parent / 'docker-compose.yml'
+    
+    if not compose_file.exists():
+        logger.error(f"docker-compose.yml not found at {compose_file}")
+        return None
+    
+    compose_bucket = config.config['deployment'].get('compose_s3_bucket')
+    if compose_bucket:
+        # Ship a short S3 reference instead of the file itself
+        compose_key = _upload_compose(config, compose_bucket, compose_file)
+        if compose_key is None:
+            return None
+        compose_env = {'COMPOSE_B64': '', 'COMPOSE_S3_URI': f"s3://{compose_bucket}/{compose_key}"}
+    else:
+        # Base64 avoids all quote/escape issues with heredoc when transferring the file
+        compose_content_b64 = _load_compose_b64(compose_file, compose_file.stat().st_mtime_ns)
+        compose_env = {'COMPOSE_B64': compose_content_b64}
+    
+    return _render_script(_DEPLOY_SCRIPT, {
+        'VOLUME_NAME': config.config['docker']['volume_name'],
+        **_stack_env(config),
+        'VLLM_IMAGE': f"{config.ecr_registry}/{config.ecr_vllm_repository}:{image_tag}",
+        'GATEWAY_IMAGE': f"{config.ecr_registry}/{config.ecr_gateway_repository}:{image_tag}",
+        'FORCE_REDEPLOY': '1' if force_redeploy else '0',
+        **_validation_env(config, validate),
+        **compose_env,
+    })
+
+
 def deploy_compose_stack_via_ssm(
     config: DeploymentConfig,
     image_tag: str = "latest",
-    force_redeploy: bool = True
+    force_redeploy: bool = True,
+    quick_only: bool = False,
+    validate: bool = True
 ) -> Optional[str]:
     """
     Send SSM run command to deploy Docker Compose stack:
@@ -182,120 +432,29 @@ def deploy_compose_stack_via_ssm(
     4. Pull both Docker images (vllm + gateway)
     5. Copy docker-compose.yml to EC2
     6. Run docker-compose up with environment variables
+    7. Wait for the compose healthchecks and report gateway health (if validate=True)
+    
+    Validation runs inside the same command, so a successful return means the
+    stack is healthy. With quick_only=True, only restarts the stack already on the instance
+    (no pull, no compose file transfer) and waits for it to be healthy.
     
     Returns:
         Command ID if successful, None otherwise
     """
     logger.info(f"Deploying Docker Compose stack to {config.instance_id} via SSM")
     
-    ssm_client = boto3.client('ssm', region_name=config.region)
+    ssm_client = config.ssm
     
-    # Read docker-compose.yml from project root
-    script_dir = Path(__file__).parent
-    compose_file = script_dir.parent / 'docker-compose.yml'
+    if quick_only:
+        command_string = _render_script(_RESTART_SCRIPT, {
+            **_stack_env(config),
+            **_validation_env(config, validate),
+        })
+    else:
+        command_string = _build_deploy_script(config, image_tag, force_redeploy, validate)
+        if command_string is None:
+            return None
     
-    if not compose_file.exists():
-        logger.error(f"docker-compose.yml not found at {compose_file}")
-        return None
-    
-    with open(compose_file, 'r', encoding='utf-8') as f:
-        compose_content = f.read()
-    
-    # Use base64 encoding to safely transfer the file content
-    # This avoids all quote/escape issues with heredoc
-    import base64
-    compose_content_b64 = base64.b64encode(compose_content.encode('utf-8')).decode('ascii')
-    
-    volume_name = config.config['docker']['volume_name']
-    
-    commands = [
-        "#!/bin/bash",
-        "set -e",  # Exit on error
-        "",
-        "# Set HOME explicitly for SSM shell environment",
-        "export HOME=${HOME:-/root}",
-        "cd $HOME",
-        "",
-        "# Disable pagers to prevent interactive prompts in SSM",
-        "export PAGER=cat",
-        "export AWS_PAGER=\"\"",
-        "export GIT_PAGER=cat",
-        "export SYSTEMD_PAGER=cat",
-        "",
-        "echo '=== Docker Volume Setup ==='",
-        f"docker volume create {volume_name} || true",
-        f"echo 'Volume {volume_name} ready'",
-        "",
-        "echo '=== Retrieving Secrets ==='",
-        f"HF_TOKEN=$(aws secretsmanager get-secret-value "
-        f"--secret-id {config.hf_token_secret_name} "
-        f"--query SecretString --output text --region {config.region})",
-        "",
-        "echo '=== Setting Environment Variables ==='",
-        f"export ECR_REGISTRY={config.ecr_registry}",
-        "export HF_TOKEN=\"$HF_TOKEN\"",
-        f"export CORS_ORIGINS=\"{config.config['gateway']['cors_origins']}\"",
-        "echo 'Environment configured for Stage 2 deployment'",
-        "",
-    ]
-    
-    if force_redeploy:
-        commands.extend([
-            "echo '=== Cleaning Up Existing Containers ==='",
-            "",
-            "# Stop and remove docker-compose stack (Stage 2 containers)",
-            "# Suppress warnings about env vars from old compose file",
-            "docker compose down 2>&1 | grep -v 'variable is not set' || echo 'No existing compose stack'",
-            "",
-            "# Remove any standalone containers from Stage 1 deployment",
-            "# (prevents container name conflicts)",
-            "echo 'Checking for Stage 1 containers...'",
-            "docker stop vllm-server 2>/dev/null || echo 'No Stage 1 vllm-server running'",
-            "docker rm vllm-server 2>/dev/null || echo 'No Stage 1 vllm-server to remove'",
-            "",
-            "echo '=== Cleaning Up Unused Docker Resources ==='",
-            "# Remove old images, stopped containers, and unused networks",
-            "# Keep volumes to preserve model cache (huggingface-cache)",
-            "docker system prune -af --filter 'until=24h' 2>&1 || echo 'Cleanup completed'",
-            "echo 'Disk space after cleanup:'",
-            "df -h / | grep -E 'Filesystem|/dev/root'",
-            "",
-        ])
-    
-    commands.extend([
-        "echo '=== ECR Login ==='",
-        f"aws ecr get-login-password --region {config.region} | "
-        f"docker login --username AWS --password-stdin {config.ecr_registry} 2>&1 | grep -v 'WARNING'",
-        "",
-        "echo '=== Pulling Docker Images ==='",
-        f"docker pull {config.ecr_registry}/{config.ecr_vllm_repository}:{image_tag} 2>&1 | grep -v 'Pulling\\|Waiting\\|Downloading\\|Verifying\\|Download complete\\|Pull complete' || true",
-        "echo 'vLLM image ready'",
-        f"docker pull {config.ecr_registry}/{config.ecr_gateway_repository}:{image_tag} 2>&1 | grep -v 'Pulling\\|Waiting\\|Downloading\\|Verifying\\|Download complete\\|Pull complete' || true",
-        "echo 'Gateway image ready'",
-        "",
-        "echo '=== Writing docker-compose.yml ==='",
-        f"echo '{compose_content_b64}' | base64 -d > docker-compose.yml",
-        "",
-        "echo 'Current directory:' && pwd",
-        "echo 'docker-compose.yml exists:' && ls -la docker-compose.yml",
-        "echo 'Environment variables:'",
-        "echo \"ECR_REGISTRY=$ECR_REGISTRY\"",
-        "echo \"HF_TOKEN=${HF_TOKEN:0:20}...\"",
-        "echo \"CORS_ORIGINS=$CORS_ORIGINS\"",
-        "",
-        "echo '=== Starting Docker Compose Stack ==='",
-        "docker compose up -d 2>&1",
-        "",
-        "echo '=== Verifying Stack Status ==='",
-        "sleep 5",  # Brief wait for containers to initialize
-        "docker compose ps",
-        "",
-        "echo '=== Deployment Complete ==='",
-        "echo 'vLLM server: http://localhost:8000'",
-        "echo 'Gateway API: http://localhost:8080'",
-    ])
-    
-    command_string = "\n".join(commands)
     log_group = config.config['cloudwatch']['log_group_ssm']
     timeout = config.config['deployment']['ssm_command_timeout_seconds']
     
@@ -316,39 +475,44 @@ def deploy_compose_stack_via_ssm(
         logger.info(f"SSM Command ID: {command_id}")
         logger.info(f"CloudWatch Logs: {log_group}")
         
-        # Wait for command to complete
+        # Stream output while botocore's waiter polls for completion (the waiter
+        # treats the not-yet-registered invocation as pending)
         logger.info("Waiting for command execution...")
+        tailer = CommandLogTailer(config, log_group, command_id)
+        tailer.start()
         retry_delay = config.config['deployment']['retry_delay_seconds']
         timeout = config.config['deployment']['ssm_command_timeout_seconds']
-        max_attempts = timeout // retry_delay  # Calculate attempts based on timeout
         
-        for attempt in range(max_attempts):
-            time.sleep(retry_delay)
-            
-            cmd_response = ssm_client.get_command_invocation(
+        waiter = ssm_client.get_waiter('command_executed')
+        try:
+            waiter.wait(
                 CommandId=command_id,
-                InstanceId=config.instance_id
+                InstanceId=config.instance_id,
+                WaiterConfig={'Delay': retry_delay, 'MaxAttempts': timeout // retry_delay}
             )
-            
-            status = cmd_response['Status']
-            
-            if status == 'Success':
-                logger.success("Deployment command executed successfully")
-                logger.info("Output:")
-                print(cmd_response.get('StandardOutputContent', ''))
-                return command_id
-            elif status in ['Failed', 'Cancelled', 'TimedOut']:
+        except WaiterError as e:
+            tailer.stop()
+            status = (e.last_response or {}).get('Status')
+            if status in ['Failed', 'Cancelled', 'TimedOut']:
                 logger.error(f"Deployment failed with status: {status}")
-                logger.error("Error output:")
-                print(cmd_response.get('StandardErrorContent', ''))
-                return None
-            elif status in ['InProgress', 'Pending']:
-                if (attempt + 1) % 6 == 0:  # Log every minute (6 * 10 seconds)
-                    logger.info(f"Still running... ({(attempt + 1) * retry_delay}s elapsed)")
-                continue
+                if not tailer.events_seen:
+                    logger.error("Error output:")
+                    print(e.last_response.get('StandardErrorContent', ''))
+            else:
+                logger.error(f"Command execution timed out: {e}")
+            return None
         
-        logger.error("Command execution timed out")
-        return None
+        tailer.stop()
+        logger.success("Deployment command executed successfully")
+        if not tailer.events_seen:
+            # CloudWatch output unavailable: fall back to the (truncated) inline output
+            cmd_response = ssm_client.get_command_invocation(
+                CommandId=command_id,
+                InstanceId=config.instance_id
+            )
+            logger.info("Output:")
+            print(cmd_response.get('StandardOutputContent', ''))
+        return command_id
         
     except ClientError as e:
         logger.error(f"Failed to send SSM command: {e}")
@@ -356,16 +520,18 @@ def deploy_compose_stack_via_ssm(
 
 
 def validate_deployment(config: DeploymentConfig) -> bool:
-    """Verify both containers are running and healthy via health check endpoints"""
+    """Verify both containers are running and healthy (standalone re-check for --validate-only)"""
     logger.info("Validating deployment...")
     
-    ssm_client = boto3.client('ssm', region_name=config.region)
+    ssm_client = config.ssm
     vllm_port = config.config['vllm']['api_port']
     gateway_port = config.config['gateway']['api_port']
     timeout = config.config['deployment']['health_check_timeout_seconds']
     interval = config.config['deployment']['health_check_interval_seconds']
+    log_group = config.config['cloudwatch']['log_group_ssm']
     
-    # Check both containers via SSM
+    # Readiness is gated by the compose healthchecks (deploy runs `up --wait`), so
+    # this is a single status check with no polling
     health_check_cmd = f"""
     #!/bin/bash
     
@@ -380,64 +546,26 @@ def validate_deployment(config: DeploymentConfig) -> bool:
     cd $HOME
     docker compose ps
     
-    # Check if both containers are running
-    VLLM_RUNNING=$(docker ps --filter name=vllm-server --format '{{{{.Names}}}}')
-    GATEWAY_RUNNING=$(docker ps --filter name=fastapi-gateway --format '{{{{.Names}}}}')
-    
-    if [ "$VLLM_RUNNING" != "vllm-server" ]; then
-        echo "ERROR: vLLM container is not running"
-        docker ps -a --filter name=vllm-server
-        echo "=== vLLM logs ==="
-        docker logs vllm-server --tail 100
-        exit 1
-    fi
+    VLLM_HEALTH=$(docker inspect --format '{{{{.State.Health.Status}}}}' vllm-server 2>/dev/null)
+    GATEWAY_HEALTH=$(docker inspect --format '{{{{.State.Health.Status}}}}' fastapi-gateway 2>/dev/null)
     
-    if [ "$GATEWAY_RUNNING" != "fastapi-gateway" ]; then
-        echo "ERROR: Gateway container is not running"
-        docker ps -a --filter name=fastapi-gateway
-        echo "=== Gateway logs ==="
-        docker logs fastapi-gateway --tail 100
-        exit 1
+    if [ "$VLLM_HEALTH" = "healthy" ] && [ "$GATEWAY_HEALTH" = "healthy" ]; then
+        echo "✅ vLLM server is healthy"
+        echo "✅ Gateway is healthy"
+        
+        # Get detailed health status
+        echo "=== Gateway Health Details ==="
+        curl -s http://localhost:{gateway_port}/health | python3 -m json.tool
+        
+        echo ""
+        echo "SUCCESS: Full stack is healthy"
+        echo "- vLLM: http://localhost:{vllm_port}"
+        echo "- Gateway: http://localhost:{gateway_port}"
+        echo "- API Docs: http://localhost:{gateway_port}/docs"
+        exit 0
     fi
     
-    echo "Both containers running, checking health endpoints..."
-    
-    # Check vLLM health endpoint (may take 4-5 mins for model loading)
-    echo "Checking vLLM health (model loading may take 4-5 minutes)..."
-    max_attempts={timeout // interval}
-    for i in $(seq 1 $max_attempts); do
-        if curl -f http://localhost:{vllm_port}/health 2>/dev/null; then
-            echo "✅ vLLM server is healthy"
-            break
-        fi
-        echo "Attempt $i/$max_attempts: vLLM not ready, waiting..."
-        sleep {interval}
-    done
-    
-    # Check gateway health endpoint
-    echo "Checking FastAPI gateway health..."
-    for i in $(seq 1 10); do
-        if curl -f http://localhost:{gateway_port}/health 2>/dev/null; then
-            echo "✅ Gateway is healthy"
-            
-            # Get detailed health status
-            echo "=== Gateway Health Details ==="
-            curl -s http://localhost:{gateway_port}/health | python3 -m json.tool
-            
-            echo ""
-            echo "SUCCESS: Full stack is healthy"
-            echo "- vLLM: http://localhost:{vllm_port}"
-            echo "- Gateway: http://localhost:{gateway_port}"
-            echo "- API Docs: http://localhost:{gateway_port}/docs"
-            exit 0
-        fi
-        echo "Gateway attempt $i/10: waiting..."
-        sleep 3
-    done
-    
-    echo "ERROR: Health checks failed"
-    echo "=== Stack Status ==="
-    docker compose ps
+    echo "ERROR: Health checks failed (vLLM: ${{VLLM_HEALTH:-not running}}, gateway: ${{GATEWAY_HEALTH:-not running}})"
     echo "=== vLLM Logs (last 200 lines) ==="
     docker logs vllm-server --tail 200
     echo "=== Gateway Logs (last 200 lines) ==="
@@ -454,38 +582,44 @@ def validate_deployment(config: DeploymentConfig) -> bool:
             DocumentName='AWS-RunShellScript',
             Parameters={'commands': [health_check_cmd]},
             CloudWatchOutputConfig={
-                'CloudWatchLogGroupName': config.config['cloudwatch']['log_group_ssm'],
+                'CloudWatchLogGroupName': log_group,
                 'CloudWatchOutputEnabled': True
             }
         )
         
         command_id = response['Command']['CommandId']
         
-        # Wait for health check to complete
-        time.sleep(5)  # Initial wait
+        # Stream the status report (and failure logs) while waiting for the one-shot
+        # `docker inspect` check; the health-check settings only bound the wait
+        tailer = CommandLogTailer(config, log_group, command_id)
+        tailer.start()
+        waiter = ssm_client.get_waiter('command_executed')
+        try:
+            waiter.wait(
+                CommandId=command_id,
+                InstanceId=config.instance_id,
+                WaiterConfig={'Delay': interval, 'MaxAttempts': timeout // interval}
+            )
+        except WaiterError as e:
+            tailer.stop()
+            status = (e.last_response or {}).get('Status')
+            if status in ['Failed', 'Cancelled', 'TimedOut']:
+                logger.error("Health check failed")
+                if not tailer.events_seen:
+                    logger.error(e.last_response.get('StandardErrorContent', ''))
+            else:
+                logger.error(f"Health check timed out: {e}")
+            return False
         
-        for _ in range(timeout // 5):
+        tailer.stop()
+        logger.success("Health check passed!")
+        if not tailer.events_seen:
             cmd_response = ssm_client.get_command_invocation(
                 CommandId=command_id,
                 InstanceId=config.instance_id
             )
-            
-            status = cmd_response['Status']
-            
-            if status == 'Success':
-                logger.success("Health check passed!")
-                logger.info(cmd_response.get('StandardOutputContent', ''))
-                return True
-            elif status in ['Failed', 'Cancelled', 'TimedOut']:
-                logger.error("Health check failed")
-                logger.error(cmd_response.get('StandardErrorContent', ''))
-                return False
-            elif status in ['InProgress', 'Pending']:
-                time.sleep(5)
-                continue
-        
-        logger.error("Health check timed out")
-        return False
+            logger.info(cmd_response.get('StandardOutputContent', ''))
+        return True
         
     except ClientError as e:
         logger.error(f"Failed to run health check: {e}")
@@ -512,10 +646,15 @@ def main():
         action='store_true',
         help='Skip health check validation'
     )
+    parser.add_argument(
+        '--validate-only',
+        action='store_true',
+        help='Only check the health of the running stack (no deploy)'
+    )
     parser.add_argument(
         '--quick-restart',
         action='store_true',
-        help='Quick restart: just restart existing container without pulling new image'
+        help='Quick restart: just restart the existing stack without pulling new images'
     )
     
     args = parser.parse_args()
@@ -539,33 +678,39 @@ def main():
         else:
             logger.info("Skipping EC2 instance start")
         
-        # Step 2: Deploy Docker Compose stack
+        if args.validate_only:
+            if not validate_deployment(config):
+                logger.error("Deployment validation failed")
+                sys.exit(1)
+            logger.success("=== Stack is healthy ===")
+            return
+        
+        # Step 2: Deploy Docker Compose stack (validated in the same SSM command)
+        validate = not args.skip_validation
+        if not validate:
+            logger.info("Skipping validation")
+        
         if args.quick_restart:
             logger.info("Quick restart: restarting existing stack...")
             command_id = deploy_compose_stack_via_ssm(
                 config,
                 image_tag=args.image_tag,
-                force_redeploy=False
+                force_redeploy=False,
+                quick_only=True,
+                validate=validate
             )
         else:
             command_id = deploy_compose_stack_via_ssm(
                 config,
                 image_tag=args.image_tag,
-                force_redeploy=True
+                force_redeploy=True,
+                validate=validate
             )
         
         if not command_id:
             logger.error("Deployment failed")
             sys.exit(1)
         
-        # Step 3: Validate deployment (both containers)
-        if not args.skip_validation:
-            if not validate_deployment(config):
-                logger.error("Deployment validation failed")
-                sys.exit(1)
-        else:
-            logger.info("Skipping validation")
-        
         logger.success("=== Deployment Complete ===")
         vllm_port = config.config['vllm']['api_port']
         logger.info(f"✅ vLLM server: http://<instance-ip>:{vllm_port}")
@@ -0,0 +1,143 @@
+#!/bin/bash
+# Stage 2 stack deployment, run on the EC2 instance via SSM (see deploy.py).
+#
+# Static script: deploy.py prepends `export` lines for the variables below, so
+# it can also be run by hand with the same variables set in the environment.
+#
+#   VOLUME_NAME       Docker volume for the HuggingFace model cache
+#   HF_SECRET         Secrets Manager secret holding the HuggingFace token
+#   HF_SECRET_VERSION Current version ID of HF_SECRET; when set, the token is cached
+#                     on the instance and only re-fetched after the secret changes
+#   REGION            AWS region (Secrets Manager + ECR)
+#   ECR_REGISTRY      ECR registry host
+#   VLLM_IMAGE        Full vLLM image reference to pull
+#   GATEWAY_IMAGE     Full gateway image reference to pull
+#   CORS_ORIGINS      Gateway CORS origins
+#   FORCE_REDEPLOY    1 to tear down the existing stack first, 0 to keep it
+#   VALIDATE          1 to wait for compose healthchecks and report health, 0 to skip
+#   WAIT_TIMEOUT      Seconds to wait for the stack to become healthy
+#   GATEWAY_PORT      Gateway port, for the final health report
+#   COMPOSE_B64       docker-compose.yml, base64-encoded (or COMPOSE_S3_URI)
+#   COMPOSE_S3_URI    S3 URI of docker-compose.yml (used when COMPOSE_B64 is empty)
+set -e
+
+: "${VOLUME_NAME:?}" "${HF_SECRET:?}" "${REGION:?}" "${ECR_REGISTRY:?}" "${VLLM_IMAGE:?}"
+: "${GATEWAY_IMAGE:?}" "${FORCE_REDEPLOY:?}" "${VALIDATE:?}" "${WAIT_TIMEOUT:?}" "${GATEWAY_PORT:?}"
+
+# Set HOME explicitly for SSM shell environment
+export HOME=${HOME:-/root}
+cd $HOME
+
+# Disable pagers to prevent interactive prompts in SSM
+export PAGER=cat
+export AWS_PAGER=""
+export GIT_PAGER=cat
+export SYSTEMD_PAGER=cat
+
+echo '=== Docker Volume Setup ==='
+docker volume create "$VOLUME_NAME" || true
+echo "Volume $VOLUME_NAME ready"
+
+# ECR login runs in the background so its AWS CLI start-up overlaps the secret
+# fetch and cleanup below
+(aws ecr get-login-password --region "$REGION" | docker login --username AWS --password-stdin "$ECR_REGISTRY" 2>&1 | grep -v 'WARNING') &
+ECR_LOGIN_PID=$!
+
+echo '=== Retrieving Secrets ==='
+# Root-only token cache, keyed by the secret version resolved by deploy.py
+TOKEN_CACHE_DIR=${TOKEN_CACHE_DIR:-/etc/slm-ft}
+if [ -n "$HF_SECRET_VERSION" ] && [ -f "$TOKEN_CACHE_DIR/hf_token" ] \
+    && [ "$(cat "$TOKEN_CACHE_DIR/hf_token.version" 2>/dev/null)" = "$HF_SECRET_VERSION" ]; then
+    HF_TOKEN=$(cat "$TOKEN_CACHE_DIR/hf_token")
+    echo 'Using cached HF token (secret unchanged)'
+elif [ -n "$HF_SECRET_VERSION" ]; then
+    HF_TOKEN=$(aws secretsmanager get-secret-value --secret-id "$HF_SECRET" --version-id "$HF_SECRET_VERSION" --query SecretString --output text --region "$REGION")
+    (umask 077 && mkdir -p "$TOKEN_CACHE_DIR" \
+        && printf '%s' "$HF_TOKEN" > "$TOKEN_CACHE_DIR/hf_token" \
+        && printf '%s' "$HF_SECRET_VERSION" > "$TOKEN_CACHE_DIR/hf_token.version") \
+        || echo 'Could not cache HF token'
+else
+    HF_TOKEN=$(aws secretsmanager get-secret-value --secret-id "$HF_SECRET" --query SecretString --output text --region "$REGION")
+fi
+
+echo '=== Setting Environment Variables ==='
+export ECR_REGISTRY
+export HF_TOKEN="$HF_TOKEN"
+export CORS_ORIGINS
+echo 'Environment configured for Stage 2 deployment'
+
+if [ "$FORCE_REDEPLOY" = "1" ]; then
+    echo '=== Cleaning Up Existing Containers ==='
+
+    # Stop and remove docker-compose stack (Stage 2 containers)
+    # Suppress warnings about env vars from old compose file
+    docker compose down 2>&1 | grep -v 'variable is not set' || echo 'No existing compose stack'
+
+    # Remove any standalone containers from Stage 1 deployment
+    # (prevents container name conflicts)
+    echo 'Checking for Stage 1 containers...'
+    docker stop vllm-server 2>/dev/null || echo 'No Stage 1 vllm-server running'
+    docker rm vllm-server 2>/dev/null || echo 'No Stage 1 vllm-server to remove'
+
+    echo '=== Cleaning Up Unused Docker Resources ==='
+    # Remove old images, stopped containers, and unused networks
+    # Keep volumes to preserve model cache (huggingface-cache)
+    docker system prune -af --filter 'until=24h' 2>&1 || echo 'Cleanup completed'
+    echo 'Disk space after cleanup:'
+    df -h / | grep -E 'Filesystem|/dev/root'
+fi
+
+echo '=== ECR Login (joined before pulling) ==='
+wait $ECR_LOGIN_PID
+
+echo '=== Pulling Docker Images ==='
+# Pull both images concurrently; wall time is the slower pull, not the sum
+PULL_PROGRESS='Pulling\|Waiting\|Downloading\|Verifying\|Download complete\|Pull complete'
+(docker pull "$VLLM_IMAGE" 2>&1 | grep -v "$PULL_PROGRESS" || true; echo 'vLLM image ready') &
+(docker pull "$GATEWAY_IMAGE" 2>&1 | grep -v "$PULL_PROGRESS" || true; echo 'Gateway image ready') &
+wait
+
+echo '=== Writing docker-compose.yml ==='
+if [ -n "$COMPOSE_B64" ]; then
+    echo "$COMPOSE_B64" | base64 -d > docker-compose.yml
+else
+    aws s3 cp "${COMPOSE_S3_URI:?}" docker-compose.yml
+fi
+
+echo 'Current directory:' && pwd
+echo 'docker-compose.yml exists:' && ls -la docker-compose.yml
+echo 'Environment variables:'
+echo "ECR_REGISTRY=$ECR_REGISTRY"
+echo "HF_TOKEN=${HF_TOKEN:0:20}..."
+echo "CORS_ORIGINS=$CORS_ORIGINS"
+
+echo '=== Starting Docker Compose Stack ==='
+if [ "$VALIDATE" = "1" ]; then
+    # --wait blocks until every service's compose healthcheck passes (vLLM model load included)
+    if ! docker compose up -d --wait --wait-timeout "$WAIT_TIMEOUT" 2>&1; then
+        echo "ERROR: Stack did not become healthy within ${WAIT_TIMEOUT}s"
+        docker compose ps
+        echo '=== vLLM logs ==='
+        docker logs vllm-server --tail 100
+        echo '=== Gateway logs ==='
+        docker logs fastapi-gateway --tail 100
+        echo '=== GPU Status ==='
+        nvidia-smi
+        exit 1
+    fi
+else
+    docker compose up -d 2>&1
+fi
+
+echo '=== Verifying Stack Status ==='
+docker compose ps
+
+if [ "$VALIDATE" = "1" ]; then
+    echo '=== Gateway Health Details ==='
+    curl -s "http://localhost:$GATEWAY_PORT/health" | python3 -m json.tool
+    echo 'SUCCESS: Full stack is healthy'
+fi
+
+echo '=== Deployment Complete ==='
+echo 'vLLM server: http://localhost:8000'
+echo 'Gateway API: http://localhost:8080'
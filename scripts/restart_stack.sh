@@ -0,0 +1,69 @@
+#!/bin/bash
+# Quick restart of the deployed stack, run on the EC2 instance via SSM (see
+# deploy.py --quick-restart). Reuses the docker-compose.yml and images from the
+# last full deploy; nothing is pulled or recreated.
+#
+#   HF_SECRET         Secrets Manager secret holding the HuggingFace token
+#   HF_SECRET_VERSION Current version ID of HF_SECRET; the token cached by the last
+#                     full deploy is reused when it matches
+#   REGION            AWS region (Secrets Manager)
+#   ECR_REGISTRY      ECR registry host
+#   CORS_ORIGINS      Gateway CORS origins
+#   VALIDATE          1 to wait for compose healthchecks, 0 to return after restart
+#   WAIT_TIMEOUT      Seconds to wait for the stack to become healthy
+#   GATEWAY_PORT      Gateway port, for the final health report
+set -e
+
+: "${HF_SECRET:?}" "${REGION:?}" "${ECR_REGISTRY:?}" "${CORS_ORIGINS:?}"
+: "${VALIDATE:?}" "${WAIT_TIMEOUT:?}" "${GATEWAY_PORT:?}"
+
+# Set HOME explicitly for SSM shell environment
+export HOME=${HOME:-/root}
+cd $HOME
+
+echo '=== Setting Environment Variables ==='
+# docker-compose.yml interpolates these; reuse the deploy's token cache when current
+TOKEN_CACHE_DIR=${TOKEN_CACHE_DIR:-/etc/slm-ft}
+if [ -n "$HF_SECRET_VERSION" ] && [ -f "$TOKEN_CACHE_DIR/hf_token" ] \
+    && [ "$(cat "$TOKEN_CACHE_DIR/hf_token.version" 2>/dev/null)" = "$HF_SECRET_VERSION" ]; then
+    HF_TOKEN=$(cat "$TOKEN_CACHE_DIR/hf_token")
+else
+    HF_TOKEN=$(aws secretsmanager get-secret-value --secret-id "$HF_SECRET" --query SecretString --output text --region "$REGION")
+fi
+export ECR_REGISTRY
+export HF_TOKEN
+export CORS_ORIGINS
+
+echo '=== Restarting Docker Compose Stack ==='
+docker compose restart 2>&1
+
+if [ "$VALIDATE" != "1" ]; then
+    docker compose ps
+    echo '=== Restart Complete ==='
+    exit 0
+fi
+
+echo '=== Waiting for Healthchecks ==='
+# Same compose healthchecks that gate `up --wait` in a full deploy
+for i in $(seq 1 $((WAIT_TIMEOUT / 5))); do
+    VLLM_HEALTH=$(docker inspect --format '{{.State.Health.Status}}' vllm-server 2>/dev/null || true)
+    GATEWAY_HEALTH=$(docker inspect --format '{{.State.Health.Status}}' fastapi-gateway 2>/dev/null || true)
+    if [ "$VLLM_HEALTH" = "healthy" ] && [ "$GATEWAY_HEALTH" = "healthy" ]; then
+        docker compose ps
+        echo '=== Gateway Health Details ==='
+        curl -s "http://localhost:$GATEWAY_PORT/health" | python3 -m json.tool
+        echo '=== Restart Complete ==='
+        exit 0
+    fi
+    sleep 5
+done
+
+echo "ERROR: Stack did not become healthy within ${WAIT_TIMEOUT}s"
+docker compose ps
+echo '=== vLLM logs ==='
+docker logs vllm-server --tail 100
+echo '=== Gateway logs ==='
+docker logs fastapi-gateway --tail 100
+echo '=== GPU Status ==='
+nvidia-smi
+exit 1